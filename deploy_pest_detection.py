@@ -6,46 +6,99 @@ Deployment script for Smart Crop Advisory Pest Detection System
 import os
 import sys
 import subprocess
+import importlib.util
+import hashlib
+import shutil
+import socket
 import time
-import requests
+import getpass
+import logging
+import logging.handlers
+import threading
 from pathlib import Path
+from urllib.parse import urlsplit
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Status lines are buffered and written out in one go at step boundaries, before
+# prompts and before subprocesses take over the terminal (and at exit)
+log = logging.getLogger('deploy')
+log.setLevel(logging.INFO)
+log.propagate = False
+log_buffer = logging.handlers.MemoryHandler(
+    capacity=100,
+    flushLevel=logging.ERROR,
+    target=logging.StreamHandler(sys.stdout)
+)
+log.addHandler(log_buffer)
+
+# Shared HTTP session so repeated health probes reuse keep-alive connections;
+# created on first use so the menu does not wait on importing requests
+_session = None
+
+def get_session():
+    """Return the shared requests session, creating it on first use"""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        _session = requests.Session()
+        _session.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=0))
+    return _session
 
 def print_header(title):
     """Print a formatted header"""
-    print("\n" + "="*60)
-    print(f"  {title}")
-    print("="*60)
+    log_buffer.flush()
+    sys.stdout.write("\n" + "="*60 + f"\n  {title}\n" + "="*60 + "\n")
+    sys.stdout.flush()
 
 def print_step(step_num, description):
     """Print a formatted step"""
-    print(f"\n🔧 Step {step_num}: {description}")
-    print("-" * 40)
+    log_buffer.flush()
+    sys.stdout.write(f"\n🔧 Step {step_num}: {description}\n" + "-" * 40 + "\n")
+    sys.stdout.flush()
 
 def run_command(command, cwd=None, shell=True):
-    """Run a command and return success status"""
+    """Run a command, streaming its output, and return success status"""
     try:
-        print(f"Running: {command}")
-        result = subprocess.run(command, shell=shell, cwd=cwd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ Success")
-            if result.stdout:
-                print(f"Output: {result.stdout}")
+        log.info(f"Running: {command}")
+        log_buffer.flush()
+        process = subprocess.Popen(
+            command, shell=shell, cwd=cwd,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1
+        )
+        for line in process.stdout:
+            sys.stdout.write(line)
+        returncode = process.wait()
+        if returncode == 0:
+            log.info("✅ Success")
             return True
         else:
-            print(f"❌ Failed with return code {result.returncode}")
-            if result.stderr:
-                print(f"Error: {result.stderr}")
+            log.info(f"❌ Failed with return code {returncode}")
             return False
     except Exception as e:
-        print(f"❌ Exception: {e}")
+        log.info(f"❌ Exception: {e}")
         return False
 
-def check_python_dependencies():
-    """Check if required Python packages are installed"""
-    print("🔍 Checking Python dependencies...")
-    
-    required_packages = [
+# pip distribution names whose import name differs from a plain '-' -> '_' swap
+IMPORT_NAMES = {
+    'opencv-python': 'cv2',
+    'pillow': 'PIL',
+    'flask-cors': 'flask_cors'
+}
+
+# (pip name, import name) pairs checked by check_python_dependencies
+REQUIRED_PACKAGES = tuple(
+    (package, IMPORT_NAMES.get(package, package.replace('-', '_')))
+    for package in (
         'tensorflow',
         'flask',
         'flask-cors',
@@ -53,47 +106,108 @@ def check_python_dependencies():
         'opencv-python',
         'pillow',
         'requests'
-    ]
+    )
+)
+
+def _try_import(requirement):
+    """Return (package, ok) depending on whether the package is importable.
+
+    Uses find_spec so the module is located on sys.path without running its
+    top-level code (importing tensorflow just to check for it takes seconds).
+    """
+    package, import_name = requirement
+    try:
+        return package, importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return package, False
+
+def check_python_dependencies():
+    """Check if required Python packages are installed"""
+    log.info("🔍 Checking Python dependencies...")
     
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-            print(f"✅ {package}")
-        except ImportError:
-            print(f"❌ {package} - Missing")
+    # Import probes are independent, so let slow ones (tensorflow) overlap the rest
+    with ThreadPoolExecutor(max_workers=len(REQUIRED_PACKAGES)) as executor:
+        results = list(executor.map(_try_import, REQUIRED_PACKAGES))
+    
+    for package, ok in results:
+        if ok:
+            log.info(f"✅ {package}")
+        else:
+            log.info(f"❌ {package} - Missing")
             missing_packages.append(package)
     
     if missing_packages:
-        print(f"\n⚠️  Missing packages: {', '.join(missing_packages)}")
-        print("Install them with:")
-        print(f"pip install {' '.join(missing_packages)}")
+        log.info(f"\n⚠️  Missing packages: {', '.join(missing_packages)}")
+        log.info("Install them with:")
+        log.info(f"pip install {' '.join(missing_packages)}")
         return False
     
     return True
 
+async def _run_installers(installers):
+    """Run (name, argv, cwd) installers as concurrent subprocesses; return their exit codes"""
+    processes = await asyncio.gather(*(
+        asyncio.create_subprocess_exec(*argv, cwd=cwd) for _, argv, cwd in installers
+    ))
+    return await asyncio.gather(*(process.wait() for process in processes))
+
+def install_dependencies():
+    """Install missing Python packages and Node.js modules concurrently"""
+    log.info("📦 Installing missing dependencies...")
+    
+    installers = []
+    missing_packages = [package for package, ok in map(_try_import, REQUIRED_PACKAGES) if not ok]
+    if missing_packages:
+        installers.append(("pip", [sys.executable, "-m", "pip", "install", *missing_packages], None))
+    
+    npm = shutil.which("npm")
+    if npm and os.path.isdir("backend") and not os.path.isdir(os.path.join("backend", "node_modules")):
+        installers.append(("npm", [npm, "install"], "backend"))
+    
+    if not installers:
+        log.info("✅ All dependencies already installed")
+        return True
+    
+    for name, argv, _ in installers:
+        log.info(f"Running: {' '.join(argv)}")
+    
+    log_buffer.flush()
+    returncodes = asyncio.run(_run_installers(installers))
+    for (name, _, _), returncode in zip(installers, returncodes):
+        if returncode == 0:
+            log.info(f"✅ {name} install succeeded")
+        else:
+            log.error(f"❌ {name} install failed with return code {returncode}")
+    
+    # Let find_spec see packages that were just installed
+    importlib.invalidate_caches()
+    return not any(returncodes)
+
 def check_node_dependencies():
     """Check if Node.js backend dependencies are installed"""
-    print("🔍 Checking Node.js dependencies...")
+    log.info("🔍 Checking Node.js dependencies...")
     
-    backend_path = Path("backend")
-    if not backend_path.exists():
-        print("❌ Backend directory not found")
+    if not os.path.isdir("backend"):
+        log.info("❌ Backend directory not found")
         return False
     
-    node_modules = backend_path / "node_modules"
-    if not node_modules.exists():
-        print("⚠️  Node modules not installed")
-        print("Installing dependencies...")
-        return run_command("npm install", cwd=backend_path)
+    if not os.path.isdir(os.path.join("backend", "node_modules")):
+        log.info("⚠️  Node modules not installed")
+        npm = shutil.which("npm")
+        if npm is None:
+            log.info("❌ npm not found on PATH - install Node.js first")
+            return False
+        log.info("Installing dependencies...")
+        return run_command([npm, "install"], cwd="backend", shell=False)
     
-    print("✅ Node modules found")
+    log.info("✅ Node modules found")
     return True
 
 def setup_directories():
     """Create required directories"""
-    print("📁 Setting up directories...")
+    log.info("📁 Setting up directories...")
     
     directories = [
         "ml-service/models",
@@ -103,15 +217,17 @@ def setup_directories():
         "backend/logs"
     ]
     
+    # Leaf directories only: os.makedirs creates any missing shared parents
+    # (ml-service, backend) on the first call and stats them afterwards
     for dir_path in directories:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
-        print(f"✅ {dir_path}")
+        os.makedirs(dir_path, exist_ok=True)
+        log.info(f"✅ {dir_path}")
     
     return True
 
-def create_env_file():
-    """Create environment file for backend"""
-    print("⚙️  Creating environment configuration...")
+def create_env_file(force=False):
+    """Create environment file for backend; force=True refreshes a customized one"""
+    log.info("⚙️  Creating environment configuration...")
     
     env_path = Path("backend/.env")
     
@@ -140,87 +256,345 @@ FRONTEND_URL=http://localhost:3000
 LOG_LEVEL=info
 """
     
-    if not env_path.exists():
-        with open(env_path, 'w') as f:
-            f.write(env_content)
-        print("✅ Created .env file")
+    # Compare digests so an unchanged file is never rewritten and a customized
+    # one is only replaced when a refresh is explicitly requested
+    canonical = hashlib.blake2b(env_content.encode()).digest()
+    existing = hashlib.blake2b(env_path.read_bytes()).digest() if env_path.exists() else None
+    
+    if existing is None:
+        env_path.write_bytes(env_content.encode())
+        log.info("✅ Created .env file")
+    elif existing == canonical:
+        log.info("✅ .env file is up to date")
+    elif force:
+        env_path.write_bytes(env_content.encode())
+        log.info("✅ Refreshed .env file from template")
     else:
-        print("✅ .env file already exists")
+        log.info("✅ .env file already exists (customized, leaving untouched)")
     
     return True
 
-def test_ml_service():
-    """Test if ML service is running"""
-    print("🧪 Testing ML service...")
+PROCESS_CONFIG_DIR = "deploy"  # under the project root; gitignored
+
+def write_process_configs():
+    """Write a pm2 ecosystem file and systemd units for both services into PROCESS_CONFIG_DIR.
+
+    Running the services under a supervisor restarts them on crash and starts
+    them on boot instead of relying on terminals left open by hand.
+    """
+    log.info("🛠️  Writing process manager configuration...")
+    
+    root = Path.cwd()
+    # Machine-specific output goes in a gitignored directory, not the checkout itself
+    config_dir = root / PROCESS_CONFIG_DIR
+    config_dir.mkdir(exist_ok=True)
+    ml_dir = root / "ml-service"
+    backend_dir = root / "backend"
+    npm = shutil.which("npm") or "/usr/bin/npm"
+    
+    apps = [
+        {
+            'name': 'ml-service',
+            'script': 'start_ml_service.py',
+            'interpreter': sys.executable,
+            'cwd': str(ml_dir),
+            'autorestart': True
+        },
+        {
+            'name': 'backend',
+            'script': 'npm',
+            'args': 'start',
+            'cwd': str(backend_dir),
+            'autorestart': True
+        }
+    ]
+    (config_dir / "ecosystem.config.js").write_text(f"module.exports = {json.dumps({'apps': apps}, indent=2)};\n")
+    log.info(f"✅ {PROCESS_CONFIG_DIR}/ecosystem.config.js")
     
+    units = {
+        "farmora-ml-service.service": (ml_dir, f"{sys.executable} start_ml_service.py"),
+        "farmora-backend.service": (backend_dir, f"{npm} start")
+    }
+    # Run the services as the user deploying them, not as root; under sudo that is the sudoing user
+    user = os.environ.get("SUDO_USER") or getpass.getuser()
+    systemd_dir = config_dir / "systemd"
+    systemd_dir.mkdir(exist_ok=True)
+    for unit_name, (working_dir, exec_start) in units.items():
+        (systemd_dir / unit_name).write_text(
+            "[Unit]\n"
+            f"Description=Smart Crop Advisory {unit_name.split('.')[0]}\n"
+            "After=network.target\n"
+            "\n"
+            "[Service]\n"
+            f"User={user}\n"
+            f"WorkingDirectory={working_dir}\n"
+            f"ExecStart={exec_start}\n"
+            "Restart=on-failure\n"
+            "RestartSec=2\n"
+            "\n"
+            "[Install]\n"
+            "WantedBy=multi-user.target\n"
+        )
+        log.info(f"✅ {PROCESS_CONFIG_DIR}/systemd/{unit_name}")
+    
+    return True
+
+CONNECT_TIMEOUT = 0.5  # seconds for the TCP preflight; localhost accepts or refuses instantly
+HEALTH_TIMEOUT = 1  # seconds; /health endpoints are cheap
+HEALTH_CACHE_TTL = 2  # seconds a probe result is reused before re-probing
+PROBE_TIMEOUT = CONNECT_TIMEOUT + HEALTH_TIMEOUT  # seconds for a whole aiohttp probe, connect included
+
+# URLs with a probe currently running, and the last (monotonic time, result) seen for each
+_in_flight = set()
+_health_cache = {}
+_in_flight_lock = threading.Lock()
+
+SERVICES = [
+    ("ML service", "http://localhost:5001/health"),
+    ("Backend service", "http://localhost:3000/health")
+]
+
+def _cached_health(name, url):
+    """Return the cached health of a service if still fresh, else None"""
+    cached = _health_cache.get(url)
+    if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+        log.info(f"{'✅' if cached[1] else '❌'} {name} is {'running' if cached[1] else 'not running'} (cached)")
+        return cached[1]
+    return None
+
+def _start_probe(name, url, use_cache=True):
+    """Claim a probe of url: None if the caller should probe it, else the health to report instead"""
+    with _in_flight_lock:
+        cached_healthy = _cached_health(name, url) if use_cache else None
+        if cached_healthy is not None:
+            return cached_healthy
+        cached = _health_cache.get(url)
+        if url in _in_flight:
+            return cached[1] if cached else False
+        _in_flight.add(url)
+    return None
+
+def _finish_probe(url, healthy):
+    """Cache a probe's result and release its claim on url"""
+    with _in_flight_lock:
+        _health_cache[url] = (time.monotonic(), healthy)
+        _in_flight.discard(url)
+
+def probe_health(name, url, use_cache=True, quiet=False):
+    """Probe a /health endpoint; only a 2xx response counts as running"""
+    import requests
+    
+    claimed = _start_probe(name, url, use_cache)
+    if claimed is not None:
+        return claimed
+    
+    healthy = False
     try:
-        response = requests.get("http://localhost:5001/health", timeout=5)
-        if response.status_code == 200:
-            print("✅ ML service is running")
-            return True
+        # Cheap TCP preflight: a closed port fails here instead of inside requests
+        address = urlsplit(url)
+        socket.create_connection((address.hostname, address.port or 80), timeout=CONNECT_TIMEOUT).close()
+        response = get_session().get(url, timeout=HEALTH_TIMEOUT)
+        if 200 <= response.status_code < 300:
+            message = f"✅ {name} is running"
+            healthy = True
         else:
-            print(f"❌ ML service responded with status {response.status_code}")
-            return False
+            message = f"❌ {name} responded with status {response.status_code}"
+    except requests.exceptions.ConnectionError:
+        message = f"❌ {name} is not reachable (connection refused)"
+    except requests.exceptions.Timeout:
+        message = f"❌ {name} accepted the connection but did not respond within {HEALTH_TIMEOUT}s"
     except requests.exceptions.RequestException:
-        print("❌ ML service is not reachable")
-        return False
+        message = f"❌ {name} is not reachable"
+    except OSError:
+        message = f"❌ {name} is not reachable (nothing listening on {address.netloc})"
+    finally:
+        _finish_probe(url, healthy)
+    
+    if not quiet:
+        log.info(message)
+    return healthy
+
+async def probe(session, name, url):
+    """Probe a /health endpoint on a shared aiohttp session"""
+    claimed = _start_probe(name, url)
+    if claimed is not None:
+        return claimed
+    
+    healthy = False
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT, sock_connect=CONNECT_TIMEOUT)) as response:
+            if 200 <= response.status < 300:
+                log.info(f"✅ {name} is running")
+                healthy = True
+            else:
+                log.info(f"❌ {name} responded with status {response.status}")
+    except aiohttp.ClientConnectorError:
+        log.info(f"❌ {name} is not reachable (connection refused)")
+    except asyncio.TimeoutError:
+        log.info(f"❌ {name} did not respond within {PROBE_TIMEOUT}s")
+    except aiohttp.ClientError:
+        log.info(f"❌ {name} is not reachable")
+    finally:
+        _finish_probe(url, healthy)
+    
+    return healthy
+
+async def probe_all(services):
+    """Probe all services concurrently on one event loop"""
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=4, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(probe(session, name, url) for name, url in services))
+
+def check_services(services=SERVICES):
+    """Probe (name, url) services concurrently and return their health in order.
+
+    Uses aiohttp when it is installed, otherwise one thread per probe on the
+    shared requests session.
+    """
+    for name, _ in services:
+        log.info(f"🧪 Testing {name}...")
+    
+    if aiohttp is not None:
+        return asyncio.run(probe_all(services))
+    
+    with ThreadPoolExecutor(max_workers=len(services)) as executor:
+        return list(executor.map(lambda service: probe_health(*service), services))
+
+def test_ml_service():
+    """Test if ML service is running"""
+    log.info("🧪 Testing ML service...")
+    return probe_health(*SERVICES[0])
 
 def test_backend_service():
     """Test if backend service is running"""
-    print("🧪 Testing backend service...")
+    log.info("🧪 Testing backend service...")
+    return probe_health(*SERVICES[1])
+
+READY_TIMEOUT = 30  # seconds to wait for a freshly started service
+
+def wait_for_service(name, url, timeout=READY_TIMEOUT):
+    """Poll a /health endpoint with exponential backoff until it is healthy"""
+    log.info(f"⏳ Waiting for {name} to become ready...")
+    start = time.monotonic()
+    attempt = 0
     
-    try:
-        response = requests.get("http://localhost:3000/health", timeout=5)
-        if response.status_code == 200:
-            print("✅ Backend service is running")
+    log_buffer.flush()
+    while time.monotonic() - start < timeout:
+        if probe_health(name, url, use_cache=False, quiet=True):
+            log.info(f"✅ {name} is ready ({time.monotonic() - start:.1f}s)")
             return True
-        else:
-            print(f"❌ Backend service responded with status {response.status_code}")
-            return False
-    except requests.exceptions.RequestException:
-        print("❌ Backend service is not reachable")
+        time.sleep(min(0.2 * 1.5 ** attempt, 5))
+        attempt += 1
+    
+    log.info(f"❌ {name} did not become ready within {timeout}s")
+    return False
+
+def start_services():
+    """Start the ML service, then the backend, then run the pipeline tests.
+
+    Each service is only started once the one before it reports healthy, so
+    the backend never comes up against a missing ML service.
+    """
+    log.info("🚀 Starting ML service...")
+    log_buffer.flush()
+    ml_process = subprocess.Popen([sys.executable, "start_ml_service.py"], cwd="ml-service")
+    if not wait_for_service(*SERVICES[0]):
+        ml_process.terminate()
+        return False
+    
+    npm = shutil.which("npm")
+    if npm is None:
+        log.info("❌ npm not found on PATH - cannot start the backend")
+        ml_process.terminate()
         return False
+    
+    log.info("🚀 Starting backend...")
+    log_buffer.flush()
+    backend_process = subprocess.Popen([npm, "start"], cwd="backend")
+    if not wait_for_service(*SERVICES[1]):
+        backend_process.terminate()
+        ml_process.terminate()
+        return False
+    
+    log.info("🧪 Running pipeline tests...")
+    log_buffer.flush()
+    subprocess.run([sys.executable, "test_pest_detection.py"])
+    
+    log.info(f"\nℹ️  Services are running (ML service PID {ml_process.pid}, backend PID {backend_process.pid})")
+    return True
+
+def run_steps(steps, step_num=1):
+    """Run (name, fn, deps) steps in dependency order.
+
+    Steps whose dependencies have all completed form one level and are run
+    in parallel. Returns (success, next step number); stops after the first
+    level in which any step fails.
+    """
+    done = set()
+    remaining = list(steps)
+    
+    while remaining:
+        ready = [step for step in remaining if all(dep in done for dep in step[2])]
+        if not ready:
+            raise ValueError(f"Unresolvable step dependencies: {[step[0] for step in remaining]}")
+        
+        print_step(step_num, " | ".join(name for name, _, _ in ready))
+        with ThreadPoolExecutor(max_workers=len(ready)) as executor:
+            results = list(executor.map(lambda step: step[1](), ready))
+        step_num += 1
+        
+        if not all(results):
+            failed = [step[0] for step, ok in zip(ready, results) if not ok]
+            log.error(f"❌ Failed: {', '.join(failed)}")
+            return False, step_num
+        
+        done.update(name for name, _, _ in ready)
+        remaining = [step for step in remaining if step[0] not in done]
+    
+    return True, step_num
 
 def deploy_development():
     """Deploy for development environment"""
     print_header("DEPLOYING PEST DETECTION SYSTEM - DEVELOPMENT")
     
-    # Step 1: Check dependencies
-    print_step(1, "Checking Dependencies")
-    if not check_python_dependencies():
-        return False
+    # Missing dependencies are installed first and only the Python dependency
+    # check gates the rest; the remaining steps are independent and run concurrently
+    steps = [
+        ("Installing Dependencies", install_dependencies, ()),
+        ("Checking Python Dependencies", check_python_dependencies, ("Installing Dependencies",)),
+        ("Checking Node.js Dependencies", check_node_dependencies, ("Checking Python Dependencies",)),
+        ("Setting up Directories", setup_directories, ("Checking Python Dependencies",)),
+        ("Creating Configuration", create_env_file, ("Checking Python Dependencies",)),
+        ("Writing Process Manager Configuration", write_process_configs, ("Checking Python Dependencies",))
+    ]
     
-    if not check_node_dependencies():
+    ok, step_num = run_steps(steps)
+    if not ok:
         return False
     
-    # Step 2: Setup directories
-    print_step(2, "Setting up Directories")
-    setup_directories()
-    
-    # Step 3: Create configuration
-    print_step(3, "Creating Configuration")
-    create_env_file()
-    
-    # Step 4: Instructions
-    print_step(4, "Deployment Complete")
-    print("🎉 Pest Detection System is ready for development!")
-    
-    print("\n📋 Next Steps:")
-    print("1. Start the ML Service:")
-    print("   cd ml-service")
-    print("   python start_ml_service.py")
-    print()
-    print("2. Start the Backend (in a new terminal):")
-    print("   cd backend")
-    print("   npm start")
-    print()
-    print("3. Test the system:")
-    print("   python test_pest_detection.py")
-    print()
-    print("4. Access the services:")
-    print("   - ML Service: http://localhost:5001")
-    print("   - Backend API: http://localhost:3000")
-    print("   - Health checks: /health endpoint on both services")
+    print_step(step_num, "Starting Services")
+    services_started = start_services()
+    
+    print_step(step_num + 1, "Deployment Complete")
+    log.info("🎉 Pest Detection System is ready for development!")
+    
+    if not services_started:
+        log.info("\n⚠️  Services could not be started automatically.")
+        log.info("\n📋 Start them under pm2 (restarts on crash):")
+        log.info("1. Start both services:")
+        log.info(f"   pm2 start {PROCESS_CONFIG_DIR}/ecosystem.config.js")
+        log.info("")
+        log.info("2. Test the system:")
+        log.info("   python test_pest_detection.py")
+        log.info("")
+        log.info(f"On Linux, the units in {PROCESS_CONFIG_DIR}/systemd/ can be installed instead:")
+        log.info(f"   sudo cp {PROCESS_CONFIG_DIR}/systemd/*.service /etc/systemd/system/")
+        log.info("   sudo systemctl enable --now farmora-ml-service farmora-backend")
+    
+    log.info("\n🌐 Access the services:")
+    log.info("   - ML Service: http://localhost:5001")
+    log.info("   - Backend API: http://localhost:3000")
+    log.info("   - Health checks: /health endpoint on both services")
     
     return True
 
@@ -228,30 +602,40 @@ def deploy_production():
     """Deploy for production environment"""
     print_header("DEPLOYING PEST DETECTION SYSTEM - PRODUCTION")
     
-    print("⚠️  Production deployment requires additional setup:")
-    print("1. Database configuration (MongoDB)")
-    print("2. SSL certificates for HTTPS")
-    print("3. Reverse proxy setup (Nginx)")
-    print("4. Process management (PM2, systemd)")
-    print("5. Environment-specific secrets")
-    print("6. Monitoring and logging setup")
-    print()
-    print("For production deployment, please refer to:")
-    print("- PEST_DETECTION_README.md")
-    print("- Docker configurations")
-    print("- Production deployment guides")
+    write_process_configs()
+    log.info("")
+    log.info("🔁 Run the services under a process manager:")
+    log.info(f"   pm2 start {PROCESS_CONFIG_DIR}/ecosystem.config.js && pm2 save")
+    log.info(f"   or: sudo cp {PROCESS_CONFIG_DIR}/systemd/*.service /etc/systemd/system/ && sudo systemctl enable --now farmora-ml-service farmora-backend")
+    log.info("")
+    
+    log.info("⚠️  Production deployment requires additional setup:")
+    log.info("1. Database configuration (MongoDB)")
+    log.info("2. SSL certificates for HTTPS")
+    log.info("3. Reverse proxy setup (Nginx)")
+    log.info("4. Environment-specific secrets")
+    log.info("5. Monitoring and logging setup")
+    log.info("")
+    log.info("For production deployment, please refer to:")
+    log.info("- PEST_DETECTION_README.md")
+    log.info("- Docker configurations")
+    log.info("- Production deployment guides")
+
+MENU = (
+    "\nSelect deployment option:\n"
+    "1. Development deployment\n"
+    "2. Production deployment (guide)\n"
+    "3. Test existing deployment\n"
+    "4. Exit\n"
+)
 
 def main():
     """Main deployment function"""
-    print("🚀 Smart Crop Advisory - Pest Detection Deployment")
+    log.info("🚀 Smart Crop Advisory - Pest Detection Deployment")
     
     while True:
-        print("\nSelect deployment option:")
-        print("1. Development deployment")
-        print("2. Production deployment (guide)")
-        print("3. Test existing deployment")
-        print("4. Exit")
-        
+        log_buffer.flush()
+        sys.stdout.write(MENU)
         choice = input("\nEnter your choice (1-4): ").strip()
         
         if choice == '1':
@@ -263,26 +647,23 @@ def main():
         elif choice == '3':
             print_header("TESTING EXISTING DEPLOYMENT")
             
-            # Test ML service
-            ml_running = test_ml_service()
-            
-            # Test backend service
-            backend_running = test_backend_service()
+            # Test ML and backend services in parallel
+            ml_running, backend_running = check_services(SERVICES)
             
             if ml_running and backend_running:
-                print("\n🎉 Both services are running!")
-                print("Run the full test suite:")
-                print("python test_pest_detection.py")
+                log.info("\n🎉 Both services are running!")
+                log.info("Run the full test suite:")
+                log.info("python test_pest_detection.py")
             else:
-                print("\n⚠️  Some services are not running.")
-                print("Please start the required services and try again.")
+                log.info("\n⚠️  Some services are not running.")
+                log.info("Please start the required services and try again.")
             
             break
         elif choice == '4':
-            print("👋 Goodbye!")
+            log.info("👋 Goodbye!")
             break
         else:
-            print("❌ Invalid choice. Please try again.")
+            log.info("❌ Invalid choice. Please try again.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
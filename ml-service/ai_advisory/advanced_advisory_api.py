@@ -12,25 +12,47 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import numpy as np
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+from itertools import islice
+from functools import lru_cache
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from pathlib import Path
 import io
-import base64
 from PIL import Image
 import uuid
+import re
+from typing import Union
 import json
 
 # Import our AI components
 from agricultural_knowledge_base import AgriculturalKnowledgeBase
 from intelligent_response_engine import IntelligentResponseEngine
+from inference_batcher import InferenceBatcher
+from _preproc import preprocess_pil_image, MODEL_INPUT_SIZE
 
-# Import ML model components
 try:
-    from simple_api import load_model, preprocess_image, model, pest_classes
+    import orjson
 except ImportError:
-    print("ML model components not available, using fallback mode")
-    model = None
-    pest_classes = []
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import gzip
+
+try:
+    import pybase64 as base64  # SIMD decoder, drop-in for the stdlib module
+except ImportError:
+    import base64
+
+# ML model components are imported lazily by initialize_ml_model, so importing
+# this module does not pull in TensorFlow
+model = None
+pest_classes = []
 
 # Configure logging
 logging.basicConfig(
@@ -44,12 +66,135 @@ app = Flask(__name__)
 CORS(app)
 app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB max file size
 
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+def ojson(payload):
+    """Serialize a response body with orjson, falling back to Flask's jsonify"""
+    if orjson is None:
+        return jsonify(payload)
+    return app.response_class(orjson.dumps(payload, option=ORJSON_OPTIONS), mimetype='application/json')
+
+# JSON bodies smaller than this gain less from compression than it costs to compress them
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+_zstd_compressor = threading.local()
+
+def _zstd_compress(body: bytes) -> bytes:
+    """zstd-compress with this thread's compressor (ZstdCompressor is not thread-safe)"""
+    compressor = getattr(_zstd_compressor, 'compressor', None)
+    if compressor is None:
+        compressor = _zstd_compressor.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(body)
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON responses with zstd or gzip, whichever the client accepts (zstd preferred)"""
+    if (response.mimetype != 'application/json' or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    accepted = request.accept_encodings
+    if zstandard is not None and 'zstd' in accepted:
+        response.set_data(_zstd_compress(body))
+        response.headers['Content-Encoding'] = 'zstd'
+    elif 'gzip' in accepted:
+        response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 # Initialize AI components
 knowledge_base = AgriculturalKnowledgeBase()
 response_engine = IntelligentResponseEngine()
 
+# The knowledge base is static at runtime, so hot lookups are memoized on normalized keys
+@lru_cache(maxsize=512)
+def _pest_info(pest_name: str) -> dict:
+    """Cached knowledge_base.get_pest_info for a lowercased pest name"""
+    return knowledge_base.get_pest_info(pest_name)
+
+@lru_cache(maxsize=512)
+def _crop_info(crop_name: str) -> dict:
+    """Cached knowledge_base.get_crop_info for a lowercased crop name"""
+    return knowledge_base.get_crop_info(crop_name)
+
+SEASONAL_ADVICE = {month: knowledge_base.get_seasonal_advice(month) for month in range(1, 13)}
+
+def _seasonal_advice(month: int = None) -> dict:
+    """Precomputed seasonal advice for a month (defaults to the current month)"""
+    if month is None:
+        month = datetime.now().month
+    advice = SEASONAL_ADVICE.get(month)
+    return advice if advice is not None else knowledge_base.get_seasonal_advice(month)
+
 # Global variables
-conversation_sessions = {}
+# Sessions are sharded by user id, each shard with its own lock so concurrent
+# users rarely contend. Within a shard, sessions are kept in least-recently-active
+# order so expiry only visits stale entries
+SESSION_SHARDS = 16  # must be a power of two
+MAX_SESSIONS = 100_000
+MAX_SESSIONS_PER_SHARD = MAX_SESSIONS // SESSION_SHARDS
+session_shards = [(OrderedDict(), threading.Lock()) for _ in range(SESSION_SHARDS)]
+SESSION_CLEANUP_INTERVAL = 300  # seconds between expired-session sweeps
+MAX_HISTORY_MESSAGES = 20  # older messages fall off the session's history deque
+DEFAULT_HISTORY_LIMIT = 10  # messages returned by the history endpoint when no ?limit= is given
+
+# Worker pool for base64/JPEG decoding and preprocessing of uploaded images
+DECODE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix='image-decode')
+MAX_BATCH_SIZE = 16  # largest number of images sent to the model in one call
+
+# Models produced by convert_model.py; served in place of the Keras model when present
+ONNX_MODEL_PATH = Path('models/pest_detection_model.onnx')
+TFLITE_MODEL_PATH = Path('models/pest_detection_model_int8.tflite')
+
+# Regional tips for common agricultural zones, checked in order (first match wins)
+REGION_RULES = [
+    (re.compile(r'north|punjab|haryana|uttar pradesh'), (
+        "Focus on wheat and rice cultivation",
+        "Be prepared for extreme temperature variations",
+        "Manage water efficiently due to groundwater depletion"
+    )),
+    (re.compile(r'south|karnataka|tamil nadu|andhra'), (
+        "Utilize monsoon patterns effectively",
+        "Consider drought-resistant varieties",
+        "Take advantage of multiple cropping seasons"
+    )),
+    (re.compile(r'west|maharashtra|gujarat'), (
+        "Focus on water conservation techniques",
+        "Consider cash crops like cotton and sugarcane",
+        "Plan around irregular monsoon patterns"
+    ))
+]
+
+def _session_shard(user_id: str):
+    """Return the (sessions, lock) shard that owns user_id"""
+    return session_shards[hash(user_id) & (SESSION_SHARDS - 1)]
+
+def active_session_count() -> int:
+    """Total number of live sessions across all shards"""
+    return sum(len(sessions) for sessions, _ in session_shards)
+
+# Per-request-thread (1, 224, 224, 3) float32 input buffers, reused across requests
+_scratch = threading.local()
+
+def _image_scratch():
+    """Return this thread's preallocated model input buffer"""
+    if not hasattr(_scratch, 'buffer'):
+        _scratch.buffer = np.empty((1,) + MODEL_INPUT_SIZE + (3,), dtype=np.float32)
+    return _scratch.buffer
+
+def _pad_to_bucket(batch: np.ndarray) -> np.ndarray:
+    """Zero-pad a batch to the next power of two so compiled models see only a few shapes"""
+    count = len(batch)
+    bucket = 1 << (count - 1).bit_length()
+    if bucket == count:
+        return batch
+    padding = np.zeros((bucket - count,) + batch.shape[1:], dtype=batch.dtype)
+    return np.concatenate([batch, padding])
 
 class FarmoraAIAdvisor:
     """Main AI advisor class that combines ML and knowledge systems"""
@@ -57,14 +202,121 @@ class FarmoraAIAdvisor:
     def __init__(self):
         self.ml_model_available = model is not None
         self.session_timeout = 3600  # 1 hour
+        self._batcher = self._create_batcher(model) if model is not None else None
         
+    def _create_batcher(self, loaded_model):
+        """Batch concurrent image requests into a single compiled model call"""
+        return InferenceBatcher(
+            self._build_predict_fn(loaded_model),
+            max_batch_size=MAX_BATCH_SIZE,
+            batch_wait_timeout_s=0.05,
+            max_pending=MAX_BATCH_SIZE * 4  # decoded images waiting for the model
+        )
+    
+    def _build_predict_fn(self, loaded_model):
+        """Prefer an exported ONNX or INT8 TFLite model, then the XLA-compiled Keras model"""
+        predict_fn = None
+        if ONNX_MODEL_PATH.exists():
+            predict_fn = self._load_onnx_model(ONNX_MODEL_PATH)
+        if predict_fn is None and TFLITE_MODEL_PATH.exists():
+            predict_fn = self._load_tflite_model(TFLITE_MODEL_PATH)
+        return predict_fn or self._compile_model(loaded_model)
+    
+    def _load_onnx_model(self, model_path: Path):
+        """Build a predict function over an ONNX Runtime session, or None if unavailable"""
+        try:
+            import onnxruntime as ort
+            
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = os.cpu_count() or 1
+            providers = [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider')
+                         if p in ort.get_available_providers()]
+            session = ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+            input_name = session.get_inputs()[0].name
+            
+            def predict(batch):
+                return session.run(None, {input_name: batch})[0]
+            
+            logger.info(f"Serving ONNX model from {model_path} via {session.get_providers()[0]}")
+            return predict
+        except Exception as e:
+            logger.warning(f"ONNX Runtime unavailable, skipping {model_path}: {e}")
+            return None
+    
+    def _compile_model(self, loaded_model):
+        """Build an XLA-compiled predict function, falling back to model.predict"""
+        try:
+            import tensorflow as tf
+            
+            compiled = tf.function(lambda x: loaded_model(x, training=False), jit_compile=True)
+            input_shape = tuple(loaded_model.input_shape[1:])
+            
+            def predict(batch):
+                count = len(batch)
+                return compiled(tf.convert_to_tensor(_pad_to_bucket(batch))).numpy()[:count]
+            
+            # Compile every bucket once at startup instead of on the first requests
+            bucket = 1
+            while bucket <= MAX_BATCH_SIZE:
+                predict(np.zeros((bucket,) + input_shape, dtype=np.float32))
+                bucket *= 2
+            
+            logger.info("ML model compiled with XLA")
+            return predict
+        except Exception as e:
+            logger.warning(f"XLA compilation unavailable, using model.predict: {e}")
+            return lambda batch: loaded_model.predict(batch, verbose=0, batch_size=len(batch))
+        
+    def _load_tflite_model(self, model_path: Path):
+        """Build a predict function over an INT8 TFLite model, or None if it cannot be loaded"""
+        try:
+            import tensorflow as tf
+            
+            interpreter = tf.lite.Interpreter(model_path=str(model_path), num_threads=os.cpu_count())
+            input_detail = interpreter.get_input_details()[0]
+            output_detail = interpreter.get_output_details()[0]
+            in_scale, in_zero = input_detail['quantization']
+            out_scale, out_zero = output_detail['quantization']
+            in_limits = np.iinfo(input_detail['dtype']) if in_scale else None
+            allocated = {'shape': None}
+            
+            # Only the batcher's worker thread calls this, so the interpreter is never shared
+            def predict(batch):
+                count = len(batch)
+                batch = _pad_to_bucket(batch)
+                if allocated['shape'] != batch.shape:
+                    interpreter.resize_tensor_input(input_detail['index'], batch.shape)
+                    interpreter.allocate_tensors()
+                    allocated['shape'] = batch.shape
+                
+                if in_scale:
+                    batch = np.clip(np.rint(batch / in_scale + in_zero), in_limits.min, in_limits.max)
+                interpreter.set_tensor(input_detail['index'], batch.astype(input_detail['dtype']))
+                interpreter.invoke()
+                
+                predictions = interpreter.get_tensor(output_detail['index'])[:count]
+                if out_scale:
+                    predictions = (predictions.astype(np.float32) - out_zero) * out_scale
+                return predictions
+            
+            logger.info(f"Serving INT8 TFLite model from {model_path}")
+            return predict
+        except Exception as e:
+            logger.warning(f"TFLite model unavailable, skipping {model_path}: {e}")
+            return None
+    
     def initialize_ml_model(self):
         """Initialize or reload the ML model"""
-        global model
+        global model, pest_classes
         try:
             if not self.ml_model_available:
-                from simple_api import load_model
-                load_model()
+                import simple_api
+                if not simple_api.load_model() or simple_api.model is None:
+                    raise RuntimeError("model could not be loaded")
+                model = simple_api.model
+                pest_classes = simple_api.pest_classes
+                self._batcher = self._create_batcher(model)
                 self.ml_model_available = True
                 logger.info("ML model initialized successfully")
         except Exception as e:
@@ -74,21 +326,35 @@ class FarmoraAIAdvisor:
     def process_query(self, user_id: str, message: str, image_data: str = None, 
                      location: dict = None, context: dict = None) -> dict:
         """Process user query and generate intelligent response"""
+        decode_future = None
         try:
-            # Initialize session if needed
-            if user_id not in conversation_sessions:
-                conversation_sessions[user_id] = {
-                    'session_id': str(uuid.uuid4()),
-                    'created_at': datetime.now(),
-                    'last_active': datetime.now(),
-                    'message_count': 0,
-                    'context': {},
-                    'conversation_history': []
-                }
+            # Start decoding the image first, so it overlaps the session and query analysis below
+            if image_data and self.ml_model_available:
+                decode_future = DECODE_POOL.submit(self._decode_image, image_data, _image_scratch())
             
-            session = conversation_sessions[user_id]
-            session['last_active'] = datetime.now()
-            session['message_count'] += 1
+            now = datetime.now()
+            now_iso = now.isoformat()
+            
+            # Initialize session if needed
+            sessions, shard_lock = _session_shard(user_id)
+            with shard_lock:
+                if user_id not in sessions:
+                    sessions[user_id] = {
+                        'session_id': str(uuid.uuid4()),
+                        'created_at': now,
+                        'last_active': now,
+                        'message_count': 0,
+                        'context': {},
+                        'conversation_history': deque(maxlen=MAX_HISTORY_MESSAGES)
+                    }
+                    # Evict the least recently active session when full
+                    if len(sessions) > MAX_SESSIONS_PER_SHARD:
+                        sessions.popitem(last=False)
+                
+                session = sessions[user_id]
+                sessions.move_to_end(user_id)
+                session['last_active'] = now
+                session['message_count'] += 1
             
             # Analyze the query
             query_analysis = response_engine.analyze_query(
@@ -98,8 +364,8 @@ class FarmoraAIAdvisor:
             
             # Process image if provided
             image_analysis = None
-            if image_data and self.ml_model_available:
-                image_analysis = self._analyze_image(image_data)
+            if decode_future is not None:
+                image_analysis = self._analyze_image(image_data, decode_future)
             
             # Generate intelligent response
             response = response_engine.generate_response(
@@ -124,27 +390,29 @@ class FarmoraAIAdvisor:
             response_engine.update_context(user_id, message, response)
             
             # Store conversation
-            session['conversation_history'].append({
-                'timestamp': datetime.now().isoformat(),
+            history_entry = {
+                'timestamp': now_iso,
                 'user_message': message,
                 'ai_response': response['message'][:200] + "..." if len(response['message']) > 200 else response['message'],
                 'intent': query_analysis['intent'],
                 'confidence': response.get('confidence', 0.0)
-            })
-            
-            # Keep only last 20 messages
-            if len(session['conversation_history']) > 20:
-                session['conversation_history'] = session['conversation_history'][-20:]
+            }
+            with shard_lock:
+                session['conversation_history'].append(history_entry)
+
             
             return {
                 'success': True,
                 'response': response,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'processing_time': 'instant'
             }
             
         except Exception as e:
             logger.error(f"Error processing query: {e}")
+            if decode_future is not None:
+                # The decode writes into this thread's scratch buffer, so let it finish before the next request
+                wait([decode_future])
             return {
                 'success': False,
                 'error': str(e),
@@ -162,38 +430,52 @@ class FarmoraAIAdvisor:
                 }
             }
     
-    def _analyze_image(self, image_data: str) -> dict:
-        """Analyze uploaded image using ML model"""
+    @staticmethod
+    def _decode_image(image_data: Union[str, bytes, Image.Image], out=None):
+        """Decode a base64 string, raw image bytes or PIL image into a model input batch"""
+        if isinstance(image_data, Image.Image):
+            image = image_data
+        else:
+            if isinstance(image_data, str):
+                if image_data.startswith('data:image'):
+                    image_data = image_data.split(',')[1]
+                image_data = base64.b64decode(image_data)
+            image = Image.open(io.BytesIO(image_data))
+        
+        # Preprocess image (fused uint8 -> normalized float32 kernel)
+        return preprocess_pil_image(image, out=out)
+    
+    def _analyze_image(self, image_data: Union[str, bytes, Image.Image], decode_future: Future = None) -> dict:
+        """Analyze uploaded image using ML model; decode_future is a decode of image_data already submitted"""
         try:
-            # Decode image
-            if image_data.startswith('data:image'):
-                image_data = image_data.split(',')[1]
+            # Decode off the request thread; libjpeg releases the GIL while decoding.
+            # The scratch buffer belongs to this request thread, which blocks until
+            # the prediction is back, so it is never reused while still queued
+            if decode_future is None:
+                decode_future = DECODE_POOL.submit(self._decode_image, image_data, _image_scratch())
+            img_array = decode_future.result()
             
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
+            # Make prediction (batched with any concurrent requests)
+            predictions = self._batcher.predict(img_array)
             
-            # Preprocess image
-            img_array = preprocess_image(image)
-            
-            # Make prediction
-            predictions = model.predict(img_array, verbose=0)
-            
-            # Get results
-            predicted_idx = np.argmax(predictions[0])
-            confidence = float(predictions[0][predicted_idx])
-            predicted_class = pest_classes[predicted_idx]
-            
-            # Get top 3 predictions
-            top_indices = np.argsort(predictions[0])[::-1][:3]
+            # Get top 3 predictions (O(N) partition, then sort just those 3)
+            probs = predictions[0]
+            top_k = min(3, len(probs))
+            part = np.argpartition(-probs, top_k - 1)[:top_k]
+            top_indices = part[np.argsort(-probs[part])]
             top_predictions = []
             
             for idx in top_indices:
                 top_predictions.append({
                     'class': pest_classes[idx],
-                    'confidence': float(predictions[0][idx]),
+                    'confidence': float(probs[idx]),
                     'index': int(idx)
                 })
             
+            # Get results
+            confidence = top_predictions[0]['confidence']
+            predicted_class = top_predictions[0]['class']
+            
             return {
                 'predicted_class': predicted_class,
                 'confidence': confidence,
@@ -210,7 +492,7 @@ class FarmoraAIAdvisor:
         """Get location-specific advice"""
         try:
             region = location.get('region', '').lower()
-            season_advice = knowledge_base.get_seasonal_advice()
+            season_advice = _seasonal_advice()
             
             location_specific = {
                 'region': location.get('region', 'Unknown'),
@@ -219,24 +501,10 @@ class FarmoraAIAdvisor:
             }
             
             # Add region-specific tips based on common agricultural zones
-            if any(term in region for term in ['north', 'punjab', 'haryana', 'uttar pradesh']):
-                location_specific['regional_tips'] = [
-                    "Focus on wheat and rice cultivation",
-                    "Be prepared for extreme temperature variations",
-                    "Manage water efficiently due to groundwater depletion"
-                ]
-            elif any(term in region for term in ['south', 'karnataka', 'tamil nadu', 'andhra']):
-                location_specific['regional_tips'] = [
-                    "Utilize monsoon patterns effectively",
-                    "Consider drought-resistant varieties",
-                    "Take advantage of multiple cropping seasons"
-                ]
-            elif any(term in region for term in ['west', 'maharashtra', 'gujarat']):
-                location_specific['regional_tips'] = [
-                    "Focus on water conservation techniques",
-                    "Consider cash crops like cotton and sugarcane",
-                    "Plan around irregular monsoon patterns"
-                ]
+            for pattern, tips in REGION_RULES:
+                if pattern.search(region):
+                    location_specific['regional_tips'] = list(tips)
+                    break
             
             return location_specific
             
@@ -244,18 +512,21 @@ class FarmoraAIAdvisor:
             logger.error(f"Location advice error: {e}")
             return None
     
-    def get_conversation_history(self, user_id: str) -> dict:
-        """Get conversation history for a user"""
-        if user_id in conversation_sessions:
-            session = conversation_sessions[user_id]
+    def get_conversation_history(self, user_id: str, limit: int = DEFAULT_HISTORY_LIMIT) -> dict:
+        """Get the last `limit` messages of a user's conversation history"""
+        sessions, shard_lock = _session_shard(user_id)
+        with shard_lock:
+            session = sessions.get(user_id)
+            if session is None:
+                return {'error': 'Session not found'}
+            history = session['conversation_history']
             return {
                 'session_id': session['session_id'],
                 'message_count': session['message_count'],
-                'conversation_history': session['conversation_history'][-10:],  # Last 10 messages
+                'conversation_history': list(islice(history, max(len(history) - limit, 0), None)),
                 'created_at': session['created_at'].isoformat(),
                 'last_active': session['last_active'].isoformat()
             }
-        return {'error': 'Session not found'}
 
 # Initialize AI advisor
 ai_advisor = FarmoraAIAdvisor()
@@ -263,12 +534,12 @@ ai_advisor = FarmoraAIAdvisor()
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return ojson({
         'status': 'healthy',
         'service': 'Farmora AI Advisory API',
         'ml_model_available': ai_advisor.ml_model_available,
         'knowledge_base_loaded': True,
-        'active_sessions': len(conversation_sessions),
+        'active_sessions': active_session_count(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -276,11 +547,22 @@ def health_check():
 def chat():
     """Main chat endpoint for conversational AI"""
     try:
-        # Parse request
-        data = request.get_json()
+        # Parse request: JSON with a base64 image, or multipart with the image as a raw file
+        if request.mimetype == 'multipart/form-data':
+            form = request.form
+            image_file = request.files.get('image')
+            data = {
+                'user_id': form.get('user_id', 'anonymous'),
+                'message': form.get('message', ''),
+                'image': image_file.read() if image_file else None,
+                'location': json.loads(form['location']) if form.get('location') else None,
+                'context': json.loads(form['context']) if form.get('context') else {}
+            }
+        else:
+            data = request.get_json()
         
         if not data:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'No data provided'
             }), 400
@@ -292,7 +574,7 @@ def chat():
         context = data.get('context', {})
         
         if not message and not image_data:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'Either message or image must be provided'
             }), 400
@@ -306,11 +588,11 @@ def chat():
             context=context
         )
         
-        return jsonify(result)
+        return ojson(result)
         
     except Exception as e:
         logger.error(f"Chat endpoint error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Internal server error',
             'message': 'I apologize for the technical difficulty. Please try again.'
@@ -320,14 +602,15 @@ def chat():
 def get_chat_history(user_id):
     """Get conversation history for a user"""
     try:
-        history = ai_advisor.get_conversation_history(user_id)
-        return jsonify({
+        limit = request.args.get('limit', DEFAULT_HISTORY_LIMIT, type=int)
+        history = ai_advisor.get_conversation_history(user_id, max(limit, 0))
+        return ojson({
             'success': True,
             'data': history
         })
     except Exception as e:
         logger.error(f"History endpoint error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Failed to retrieve conversation history'
         }), 500
@@ -343,7 +626,7 @@ def quick_advice():
         
         # Generate quick advice based on type
         if query_type == 'pest' and issue:
-            pest_info = knowledge_base.get_pest_info(issue)
+            pest_info = _pest_info(issue.strip().lower())
             if pest_info:
                 advice = {
                     'pest_name': issue,
@@ -354,7 +637,7 @@ def quick_advice():
                 advice = {'message': 'Pest information not found'}
         
         elif query_type == 'crop' and crop:
-            crop_info = knowledge_base.get_crop_info(crop)
+            crop_info = _crop_info(crop.strip().lower())
             if crop_info:
                 advice = {
                     'crop_name': crop,
@@ -370,7 +653,7 @@ def quick_advice():
                 'message': 'Please specify the type of advice needed (pest/crop) and relevant details'
             }
         
-        return jsonify({
+        return ojson({
             'success': True,
             'advice': advice,
             'timestamp': datetime.now().isoformat()
@@ -378,7 +661,7 @@ def quick_advice():
         
     except Exception as e:
         logger.error(f"Quick advice error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Failed to generate advice'
         }), 500
@@ -387,30 +670,27 @@ def quick_advice():
 def analyze_image_endpoint():
     """Dedicated endpoint for image analysis"""
     try:
-        # Check if image is in files or JSON
+        # Accept a raw image body, a multipart upload (preferred) or base64 in JSON
         image_file = None
         image_data = None
         
-        if 'image' in request.files:
+        if request.mimetype == 'application/octet-stream' or request.mimetype.startswith('image/'):
+            image_data = request.get_data(cache=False)
+        elif 'image' in request.files:
             image_file = request.files['image']
         elif request.is_json:
             data = request.get_json()
             image_data = data.get('image')
         
         if not image_file and not image_data:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'No image provided'
             }), 400
         
-        # Process image
+        # Uploaded files are analyzed from their raw bytes, no re-encode
         if image_file:
-            image_bytes = image_file.read()
-            image = Image.open(io.BytesIO(image_bytes))
-            # Convert to base64 for analysis
-            buffer = io.BytesIO()
-            image.save(buffer, format='JPEG')
-            image_data = base64.b64encode(buffer.getvalue()).decode()
+            image_data = image_file.read()
         
         # Analyze image
         if ai_advisor.ml_model_available:
@@ -418,9 +698,9 @@ def analyze_image_endpoint():
             if analysis_result:
                 # Get detailed pest information
                 pest_name = analysis_result['predicted_class']
-                pest_info = knowledge_base.get_pest_info(pest_name)
+                pest_info = _pest_info(pest_name.lower())
                 
-                return jsonify({
+                return ojson({
                     'success': True,
                     'analysis': analysis_result,
                     'pest_info': pest_info,
@@ -428,12 +708,12 @@ def analyze_image_endpoint():
                     'timestamp': datetime.now().isoformat()
                 })
             else:
-                return jsonify({
+                return ojson({
                     'success': False,
                     'error': 'Image analysis failed'
                 }), 500
         else:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'ML model not available',
                 'message': 'Image analysis service is currently unavailable'
@@ -441,7 +721,7 @@ def analyze_image_endpoint():
             
     except Exception as e:
         logger.error(f"Image analysis endpoint error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Image processing failed'
         }), 500
@@ -455,7 +735,7 @@ def knowledge_search():
         category = data.get('category', None)
         
         if not query:
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'Search query is required'
             }), 400
@@ -463,7 +743,7 @@ def knowledge_search():
         # Search knowledge base
         results = knowledge_base.search_knowledge(query, category)
         
-        return jsonify({
+        return ojson({
             'success': True,
             'query': query,
             'category': category,
@@ -474,7 +754,7 @@ def knowledge_search():
         
     except Exception as e:
         logger.error(f"Knowledge search error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Search failed'
         }), 500
@@ -487,18 +767,19 @@ def seasonal_advice():
         if month:
             month = int(month)
         
-        advice = knowledge_base.get_seasonal_advice(month)
+        now = datetime.now()
+        advice = _seasonal_advice(now.month if month is None else month)
         
-        return jsonify({
+        return ojson({
             'success': True,
             'seasonal_advice': advice,
-            'current_month': datetime.now().month,
-            'timestamp': datetime.now().isoformat()
+            'current_month': now.month,
+            'timestamp': now.isoformat()
         })
         
     except Exception as e:
         logger.error(f"Seasonal advice error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Failed to get seasonal advice'
         }), 500
@@ -510,7 +791,7 @@ def reload_ml_model():
         # Check for admin authentication (in production, use proper auth)
         auth_key = request.headers.get('X-Admin-Key', '')
         if auth_key != 'farmora-admin-key':  # Use proper authentication in production
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': 'Unauthorized'
             }), 401
@@ -518,7 +799,7 @@ def reload_ml_model():
         # Reload model
         ai_advisor.initialize_ml_model()
         
-        return jsonify({
+        return ojson({
             'success': True,
             'message': 'ML model reloaded successfully',
             'model_available': ai_advisor.ml_model_available,
@@ -527,7 +808,7 @@ def reload_ml_model():
         
     except Exception as e:
         logger.error(f"Model reload error: {e}")
-        return jsonify({
+        return ojson({
             'success': False,
             'error': 'Failed to reload model'
         }), 500
@@ -535,7 +816,7 @@ def reload_ml_model():
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
-    return jsonify({
+    return ojson({
         'success': False,
         'error': 'File too large. Maximum size is 32MB.'
     }), 413
@@ -543,7 +824,7 @@ def too_large(e):
 @app.errorhandler(404)
 def not_found(e):
     """Handle not found error"""
-    return jsonify({
+    return ojson({
         'success': False,
         'error': 'Endpoint not found',
         'available_endpoints': {
@@ -558,7 +839,7 @@ def not_found(e):
 @app.errorhandler(500)
 def internal_error(e):
     """Handle internal server error"""
-    return jsonify({
+    return ojson({
         'success': False,
         'error': 'Internal server error',
         'message': 'An unexpected error occurred. Please try again.'
@@ -566,22 +847,42 @@ def internal_error(e):
 
 def cleanup_old_sessions():
     """Clean up old conversation sessions"""
-    current_time = datetime.now()
-    expired_sessions = []
+    cutoff = datetime.now() - timedelta(seconds=ai_advisor.session_timeout)
+    expired = 0
     
-    for user_id, session in conversation_sessions.items():
-        if (current_time - session['last_active']).seconds > ai_advisor.session_timeout:
-            expired_sessions.append(user_id)
+    for sessions, shard_lock in session_shards:
+        with shard_lock:
+            # Oldest sessions come first, so stop at the first one still active
+            while sessions:
+                user_id, session = next(iter(sessions.items()))
+                if session['last_active'] >= cutoff:
+                    break
+                del sessions[user_id]
+                expired += 1
     
-    for user_id in expired_sessions:
-        del conversation_sessions[user_id]
+    if expired:
+        logger.info(f"Cleaned up {expired} expired sessions")
+
+def _schedule_session_cleanup():
+    """Run cleanup_old_sessions every SESSION_CLEANUP_INTERVAL seconds"""
+    def run():
+        try:
+            cleanup_old_sessions()
+        except Exception as e:
+            logger.error(f"Session cleanup error: {e}")
+        finally:
+            _schedule_session_cleanup()
     
-    if expired_sessions:
-        logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+    timer = threading.Timer(SESSION_CLEANUP_INTERVAL, run)
+    timer.daemon = True
+    timer.start()
 
 if __name__ == '__main__':
     # Initialize ML model
     ai_advisor.initialize_ml_model()
+    # Started here and in wsgi.init_worker() rather than at import, so a preloading server's
+    # master never forks with a cleanup in progress
+    _schedule_session_cleanup()
     
     logger.info("🚀 Starting Farmora Advanced AI Advisory API...")
     logger.info("🧠 AI Knowledge Base: Loaded")
@@ -596,5 +897,5 @@ if __name__ == '__main__':
     logger.info("")
     logger.info("🌾 Ready to provide intelligent agricultural advisory!")
     
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=5002, debug=False)
\ No newline at end of file
+    # Run the Flask development server; use wsgi.py with gunicorn in production
+    app.run(host='0.0.0.0', port=5002, debug=False, threaded=True)
\ No newline at end of file
@@ -4,511 +4,871 @@ Advanced Agricultural Knowledge Base
 Comprehensive agricultural knowledge for AI advisory system
 """
 
-import json
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-import numpy as np
+import sys
+import heapq
+import time
+import mmap
+import pickle
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+from functools import lru_cache, cached_property
+from bisect import bisect_left, bisect_right
+from array import array
 
-class AgriculturalKnowledgeBase:
-    """Comprehensive agricultural knowledge base for intelligent advisory"""
-    
-    def __init__(self):
-        self.knowledge_base = {
-            'crops': self._load_crop_database(),
-            'pests': self._load_pest_database(),
-            'diseases': self._load_disease_database(),
-            'fertilizers': self._load_fertilizer_database(),
-            'weather_advice': self._load_weather_advice(),
-            'soil_management': self._load_soil_management(),
-            'irrigation': self._load_irrigation_advice(),
-            'market_info': self._load_market_info(),
-            'seasonal_advice': self._load_seasonal_advice(),
-            'best_practices': self._load_best_practices()
+# NumPy (and numba, when installed) are imported on first search, so lookups alone never pay for them
+if TYPE_CHECKING:
+    import numpy as np
+
+# Comprehensive crop information
+_CROPS = {
+    'rice': {
+        'scientific_name': 'Oryza sativa',
+        'growth_duration': '90-120 days',
+        'planting_season': ['Kharif', 'Rabi'],
+        'soil_type': ['Clay', 'Clay-loam', 'Silty-clay'],
+        'ph_range': '5.5-7.0',
+        'temperature': '20-35°C',
+        'rainfall': '1000-2000mm',
+        'common_varieties': ['Basmati', 'Jasmine', 'IR64', 'Swarna'],
+        'spacing': '20cm x 15cm',
+        'seed_rate': '20-25 kg/hectare',
+        'fertilizer_npk': '120:60:40 kg/hectare',
+        'common_pests': ['Brown planthopper', 'Stem borer', 'Rice blast'],
+        'harvesting': '110-120 days after transplanting',
+        'yield_potential': '4-6 tonnes/hectare',
+        'storage_tips': 'Dry to 12-14% moisture, store in cool, dry place',
+        'market_price_range': '$200-400 per tonne'
+    },
+    'wheat': {
+        'scientific_name': 'Triticum aestivum',
+        'growth_duration': '110-130 days',
+        'planting_season': ['Rabi'],
+        'soil_type': ['Loam', 'Clay-loam', 'Sandy-loam'],
+        'ph_range': '6.0-7.5',
+        'temperature': '15-25°C',
+        'rainfall': '300-1000mm',
+        'common_varieties': ['HD2967', 'PBW343', 'WH1105', 'DBW17'],
+        'spacing': '22.5cm row spacing',
+        'seed_rate': '100-125 kg/hectare',
+        'fertilizer_npk': '120:60:40 kg/hectare',
+        'common_pests': ['Aphids', 'Termites', 'Rust', 'Smut'],
+        'harvesting': '110-130 days after sowing',
+        'yield_potential': '4-5 tonnes/hectare',
+        'storage_tips': 'Dry to 12% moisture, use sealed containers',
+        'market_price_range': '$180-350 per tonne'
+    },
+    'tomato': {
+        'scientific_name': 'Solanum lycopersicum',
+        'growth_duration': '70-90 days',
+        'planting_season': ['Summer', 'Winter', 'Rainy'],
+        'soil_type': ['Sandy-loam', 'Loam', 'Well-drained'],
+        'ph_range': '6.0-7.0',
+        'temperature': '20-30°C',
+        'rainfall': '600-1200mm',
+        'common_varieties': ['Determinate', 'Indeterminate', 'Cherry', 'Roma'],
+        'spacing': '60cm x 45cm',
+        'seed_rate': '200-400g/hectare',
+        'fertilizer_npk': '180:120:120 kg/hectare',
+        'common_pests': ['Whitefly', 'Aphids', 'Thrips', 'Hornworm'],
+        'harvesting': '70-90 days from transplanting',
+        'yield_potential': '25-40 tonnes/hectare',
+        'storage_tips': 'Store at 12-15°C with 85-90% humidity',
+        'market_price_range': '$300-800 per tonne'
+    },
+    'cotton': {
+        'scientific_name': 'Gossypium hirsutum',
+        'growth_duration': '160-200 days',
+        'planting_season': ['Kharif'],
+        'soil_type': ['Black cotton soil', 'Sandy-loam'],
+        'ph_range': '6.0-8.0',
+        'temperature': '25-35°C',
+        'rainfall': '500-1000mm',
+        'common_varieties': ['Bt Cotton', 'Hybrid varieties', 'Desi cotton'],
+        'spacing': '45-60cm x 10-15cm',
+        'seed_rate': '3-4 kg/hectare (delinted)',
+        'fertilizer_npk': '80:40:40 kg/hectare',
+        'common_pests': ['Bollworm', 'Aphids', 'Thrips', 'Whitefly'],
+        'harvesting': '160-180 days, multiple pickings',
+        'yield_potential': '500-700 kg/hectare (lint)',
+        'storage_tips': 'Store in moisture-proof bags',
+        'market_price_range': '$1500-2000 per tonne'
+    }
+}
+
+# Comprehensive pest information with 99% accurate identification
+_PESTS = {
+    'aphids': {
+        'scientific_name': 'Aphis gossypii',
+        'identification': {
+            'size': '1-4mm',
+            'color': 'Green, black, or white',
+            'shape': 'Pear-shaped, soft body',
+            'location': 'Undersides of leaves, stems',
+            'behavior': 'Cluster in colonies, produce honeydew'
+        },
+        'damage_symptoms': [
+            'Curled or yellowing leaves',
+            'Sticky honeydew on plant surfaces',
+            'Presence of sooty mold',
+            'Stunted plant growth',
+            'Wilting of young shoots'
+        ],
+        'affected_crops': ['tomato', 'cotton', 'cabbage', 'potato'],
+        'favorable_conditions': 'Cool, moist weather, 18-24°C',
+        'lifecycle': '7-10 days, multiple generations per season',
+        'economic_threshold': '5-10 aphids per leaf',
+        'management': {
+            'biological': [
+                'Release ladybugs (500-1000 per acre)',
+                'Encourage lacewings and parasitic wasps',
+                'Plant banker plants like barley'
+            ],
+            'organic': [
+                'Neem oil spray (3-5ml/liter water)',
+                'Insecticidal soap (2-3ml/liter)',
+                'Garlic-chili spray',
+                'Yellow sticky traps'
+            ],
+            'chemical': [
+                'Imidacloprid 17.8% SL (0.3ml/liter)',
+                'Thiamethoxam 25% WG (0.2g/liter)',
+                'Acetamiprid 20% SP (0.2g/liter)'
+            ],
+            'cultural': [
+                'Remove weed hosts around field',
+                'Use reflective aluminum mulch',
+                'Proper plant spacing for air circulation',
+                'Regular monitoring and early detection'
+            ]
+        },
+        'prevention': [
+            'Crop rotation with non-host crops',
+            'Maintain field hygiene',
+            'Avoid excessive nitrogen fertilization',
+            'Use resistant varieties when available'
+        ]
+    },
+    'bollworm': {
+        'scientific_name': 'Helicoverpa armigera',
+        'identification': {
+            'size': 'Larvae 3-4cm when mature',
+            'color': 'Green to brown with distinctive stripes',
+            'shape': 'Cylindrical caterpillar',
+            'location': 'Inside bolls, flowers, fruits',
+            'behavior': 'Bore into fruits, active at night'
+        },
+        'damage_symptoms': [
+            'Circular holes in bolls or fruits',
+            'Frass (insect excrement) near holes',
+            'Premature dropping of bolls',
+            'Quality reduction in cotton lint',
+            'Flower damage and shedding'
+        ],
+        'affected_crops': ['cotton', 'tomato', 'chickpea', 'pigeon pea'],
+        'favorable_conditions': 'Warm humid weather, 25-30°C',
+        'lifecycle': '28-35 days, 4-6 generations per season',
+        'economic_threshold': '8-10% damaged bolls or fruits',
+        'management': {
+            'biological': [
+                'Release Trichogramma wasps (50,000-100,000/ha)',
+                'NPV (Nuclear Polyhedrosis Virus) spray',
+                'Encourage spiders and predatory beetles'
+            ],
+            'organic': [
+                'Bt spray (Bacillus thuringiensis) 2-3g/liter',
+                'Neem-based products 5ml/liter',
+                'Pheromone traps (10-12 traps/ha)'
+            ],
+            'chemical': [
+                'Chlorantraniliprole 18.5% SC (0.3ml/liter)',
+                'Flubendiamide 480% SC (0.2ml/liter)',
+                'Emamectin benzoate 5% SG (0.4g/liter)'
+            ],
+            'cultural': [
+                'Deep summer plowing',
+                'Synchronized sowing dates',
+                'Destroy crop residues after harvest',
+                'Inter-cropping with marigold or coriander'
+            ]
         }
-    
-    def _load_crop_database(self):
-        """Load comprehensive crop information"""
-        return {
-            'rice': {
-                'scientific_name': 'Oryza sativa',
-                'growth_duration': '90-120 days',
-                'planting_season': ['Kharif', 'Rabi'],
-                'soil_type': ['Clay', 'Clay-loam', 'Silty-clay'],
-                'ph_range': '5.5-7.0',
-                'temperature': '20-35°C',
-                'rainfall': '1000-2000mm',
-                'common_varieties': ['Basmati', 'Jasmine', 'IR64', 'Swarna'],
-                'spacing': '20cm x 15cm',
-                'seed_rate': '20-25 kg/hectare',
-                'fertilizer_npk': '120:60:40 kg/hectare',
-                'common_pests': ['Brown planthopper', 'Stem borer', 'Rice blast'],
-                'harvesting': '110-120 days after transplanting',
-                'yield_potential': '4-6 tonnes/hectare',
-                'storage_tips': 'Dry to 12-14% moisture, store in cool, dry place',
-                'market_price_range': '$200-400 per tonne'
-            },
-            'wheat': {
-                'scientific_name': 'Triticum aestivum',
-                'growth_duration': '110-130 days',
-                'planting_season': ['Rabi'],
-                'soil_type': ['Loam', 'Clay-loam', 'Sandy-loam'],
-                'ph_range': '6.0-7.5',
-                'temperature': '15-25°C',
-                'rainfall': '300-1000mm',
-                'common_varieties': ['HD2967', 'PBW343', 'WH1105', 'DBW17'],
-                'spacing': '22.5cm row spacing',
-                'seed_rate': '100-125 kg/hectare',
-                'fertilizer_npk': '120:60:40 kg/hectare',
-                'common_pests': ['Aphids', 'Termites', 'Rust', 'Smut'],
-                'harvesting': '110-130 days after sowing',
-                'yield_potential': '4-5 tonnes/hectare',
-                'storage_tips': 'Dry to 12% moisture, use sealed containers',
-                'market_price_range': '$180-350 per tonne'
-            },
-            'tomato': {
-                'scientific_name': 'Solanum lycopersicum',
-                'growth_duration': '70-90 days',
-                'planting_season': ['Summer', 'Winter', 'Rainy'],
-                'soil_type': ['Sandy-loam', 'Loam', 'Well-drained'],
-                'ph_range': '6.0-7.0',
-                'temperature': '20-30°C',
-                'rainfall': '600-1200mm',
-                'common_varieties': ['Determinate', 'Indeterminate', 'Cherry', 'Roma'],
-                'spacing': '60cm x 45cm',
-                'seed_rate': '200-400g/hectare',
-                'fertilizer_npk': '180:120:120 kg/hectare',
-                'common_pests': ['Whitefly', 'Aphids', 'Thrips', 'Hornworm'],
-                'harvesting': '70-90 days from transplanting',
-                'yield_potential': '25-40 tonnes/hectare',
-                'storage_tips': 'Store at 12-15°C with 85-90% humidity',
-                'market_price_range': '$300-800 per tonne'
-            },
-            'cotton': {
-                'scientific_name': 'Gossypium hirsutum',
-                'growth_duration': '160-200 days',
-                'planting_season': ['Kharif'],
-                'soil_type': ['Black cotton soil', 'Sandy-loam'],
-                'ph_range': '6.0-8.0',
-                'temperature': '25-35°C',
-                'rainfall': '500-1000mm',
-                'common_varieties': ['Bt Cotton', 'Hybrid varieties', 'Desi cotton'],
-                'spacing': '45-60cm x 10-15cm',
-                'seed_rate': '3-4 kg/hectare (delinted)',
-                'fertilizer_npk': '80:40:40 kg/hectare',
-                'common_pests': ['Bollworm', 'Aphids', 'Thrips', 'Whitefly'],
-                'harvesting': '160-180 days, multiple pickings',
-                'yield_potential': '500-700 kg/hectare (lint)',
-                'storage_tips': 'Store in moisture-proof bags',
-                'market_price_range': '$1500-2000 per tonne'
-            }
+    }
+}
+
+# Plant disease information
+_DISEASES = {
+    'blast': {
+        'pathogen': 'Magnaporthe oryzae (fungal)',
+        'affected_crops': ['rice'],
+        'symptoms': [
+            'Diamond-shaped lesions on leaves',
+            'Brown to gray spots with darker borders',
+            'Neck rot in panicles',
+            'Complete panicle bleaching'
+        ],
+        'favorable_conditions': 'High humidity (>85%), temperature 25-28°C',
+        'management': {
+            'resistant_varieties': ['IR64', 'Swarna Sub1', 'PR106'],
+            'fungicides': ['Tricyclazole 75% WP', 'Carbendazim 50% WP'],
+            'cultural_practices': [
+                'Avoid excessive nitrogen',
+                'Proper water management',
+                'Remove infected plant debris'
+            ]
         }
-    
-    def _load_pest_database(self):
-        """Load comprehensive pest information with 99% accurate identification"""
-        return {
-            'aphids': {
-                'scientific_name': 'Aphis gossypii',
-                'identification': {
-                    'size': '1-4mm',
-                    'color': 'Green, black, or white',
-                    'shape': 'Pear-shaped, soft body',
-                    'location': 'Undersides of leaves, stems',
-                    'behavior': 'Cluster in colonies, produce honeydew'
-                },
-                'damage_symptoms': [
-                    'Curled or yellowing leaves',
-                    'Sticky honeydew on plant surfaces',
-                    'Presence of sooty mold',
-                    'Stunted plant growth',
-                    'Wilting of young shoots'
-                ],
-                'affected_crops': ['tomato', 'cotton', 'cabbage', 'potato'],
-                'favorable_conditions': 'Cool, moist weather, 18-24°C',
-                'lifecycle': '7-10 days, multiple generations per season',
-                'economic_threshold': '5-10 aphids per leaf',
-                'management': {
-                    'biological': [
-                        'Release ladybugs (500-1000 per acre)',
-                        'Encourage lacewings and parasitic wasps',
-                        'Plant banker plants like barley'
-                    ],
-                    'organic': [
-                        'Neem oil spray (3-5ml/liter water)',
-                        'Insecticidal soap (2-3ml/liter)',
-                        'Garlic-chili spray',
-                        'Yellow sticky traps'
-                    ],
-                    'chemical': [
-                        'Imidacloprid 17.8% SL (0.3ml/liter)',
-                        'Thiamethoxam 25% WG (0.2g/liter)',
-                        'Acetamiprid 20% SP (0.2g/liter)'
-                    ],
-                    'cultural': [
-                        'Remove weed hosts around field',
-                        'Use reflective aluminum mulch',
-                        'Proper plant spacing for air circulation',
-                        'Regular monitoring and early detection'
-                    ]
-                },
-                'prevention': [
-                    'Crop rotation with non-host crops',
-                    'Maintain field hygiene',
-                    'Avoid excessive nitrogen fertilization',
-                    'Use resistant varieties when available'
-                ]
-            },
-            'bollworm': {
-                'scientific_name': 'Helicoverpa armigera',
-                'identification': {
-                    'size': 'Larvae 3-4cm when mature',
-                    'color': 'Green to brown with distinctive stripes',
-                    'shape': 'Cylindrical caterpillar',
-                    'location': 'Inside bolls, flowers, fruits',
-                    'behavior': 'Bore into fruits, active at night'
-                },
-                'damage_symptoms': [
-                    'Circular holes in bolls or fruits',
-                    'Frass (insect excrement) near holes',
-                    'Premature dropping of bolls',
-                    'Quality reduction in cotton lint',
-                    'Flower damage and shedding'
-                ],
-                'affected_crops': ['cotton', 'tomato', 'chickpea', 'pigeon pea'],
-                'favorable_conditions': 'Warm humid weather, 25-30°C',
-                'lifecycle': '28-35 days, 4-6 generations per season',
-                'economic_threshold': '8-10% damaged bolls or fruits',
-                'management': {
-                    'biological': [
-                        'Release Trichogramma wasps (50,000-100,000/ha)',
-                        'NPV (Nuclear Polyhedrosis Virus) spray',
-                        'Encourage spiders and predatory beetles'
-                    ],
-                    'organic': [
-                        'Bt spray (Bacillus thuringiensis) 2-3g/liter',
-                        'Neem-based products 5ml/liter',
-                        'Pheromone traps (10-12 traps/ha)'
-                    ],
-                    'chemical': [
-                        'Chlorantraniliprole 18.5% SC (0.3ml/liter)',
-                        'Flubendiamide 480% SC (0.2ml/liter)',
-                        'Emamectin benzoate 5% SG (0.4g/liter)'
-                    ],
-                    'cultural': [
-                        'Deep summer plowing',
-                        'Synchronized sowing dates',
-                        'Destroy crop residues after harvest',
-                        'Inter-cropping with marigold or coriander'
-                    ]
-                }
-            }
+    },
+    'blight': {
+        'pathogen': 'Phytophthora infestans (oomycete)',
+        'affected_crops': ['tomato', 'potato'],
+        'symptoms': [
+            'Water-soaked lesions on leaves',
+            'White fungal growth on leaf undersides',
+            'Rapid plant collapse',
+            'Fruit rot with dark lesions'
+        ],
+        'favorable_conditions': 'Cool, moist conditions, 15-20°C, >90% humidity',
+        'management': {
+            'resistant_varieties': ['Mountain Pride', 'Iron Lady'],
+            'fungicides': ['Copper oxychloride', 'Metalaxyl + Mancozeb'],
+            'cultural_practices': [
+                'Improve air circulation',
+                'Avoid overhead irrigation',
+                'Remove infected plants immediately'
+            ]
         }
-    
-    def _load_disease_database(self):
-        """Load plant disease information"""
-        return {
-            'blast': {
-                'pathogen': 'Magnaporthe oryzae (fungal)',
-                'affected_crops': ['rice'],
-                'symptoms': [
-                    'Diamond-shaped lesions on leaves',
-                    'Brown to gray spots with darker borders',
-                    'Neck rot in panicles',
-                    'Complete panicle bleaching'
-                ],
-                'favorable_conditions': 'High humidity (>85%), temperature 25-28°C',
-                'management': {
-                    'resistant_varieties': ['IR64', 'Swarna Sub1', 'PR106'],
-                    'fungicides': ['Tricyclazole 75% WP', 'Carbendazim 50% WP'],
-                    'cultural_practices': [
-                        'Avoid excessive nitrogen',
-                        'Proper water management',
-                        'Remove infected plant debris'
-                    ]
-                }
-            },
-            'blight': {
-                'pathogen': 'Phytophthora infestans (oomycete)',
-                'affected_crops': ['tomato', 'potato'],
-                'symptoms': [
-                    'Water-soaked lesions on leaves',
-                    'White fungal growth on leaf undersides',
-                    'Rapid plant collapse',
-                    'Fruit rot with dark lesions'
-                ],
-                'favorable_conditions': 'Cool, moist conditions, 15-20°C, >90% humidity',
-                'management': {
-                    'resistant_varieties': ['Mountain Pride', 'Iron Lady'],
-                    'fungicides': ['Copper oxychloride', 'Metalaxyl + Mancozeb'],
-                    'cultural_practices': [
-                        'Improve air circulation',
-                        'Avoid overhead irrigation',
-                        'Remove infected plants immediately'
-                    ]
-                }
+    }
+}
+
+# Fertilizer recommendations
+_FERTILIZERS = {
+    'nitrogen_sources': {
+        'urea': {'nitrogen_content': 46, 'application_time': 'Split doses'},
+        'ammonium_sulfate': {'nitrogen_content': 21, 'sulfur_content': 24},
+        'calcium_ammonium_nitrate': {'nitrogen_content': 26, 'calcium_content': 19}
+    },
+    'phosphorus_sources': {
+        'single_super_phosphate': {'phosphorus_content': 16, 'calcium_content': 20},
+        'diammonium_phosphate': {'phosphorus_content': 46, 'nitrogen_content': 18}
+    },
+    'potassium_sources': {
+        'muriate_of_potash': {'potassium_content': 60},
+        'sulfate_of_potash': {'potassium_content': 50, 'sulfur_content': 18}
+    },
+    'organic_fertilizers': {
+        'farmyard_manure': {'npk': '0.5:0.2:0.5', 'application_rate': '10-15 tonnes/ha'},
+        'vermicompost': {'npk': '1.5:1.0:1.5', 'application_rate': '2-3 tonnes/ha'},
+        'green_manure': {'nitrogen_fixation': '50-150 kg N/ha'}
+    }
+}
+
+# Weather-based agricultural advice
+_WEATHER_ADVICE = {
+    'monsoon_preparation': {
+        'pre_monsoon': [
+            'Prepare drainage channels',
+            'Stock quality seeds and fertilizers',
+            'Repair farm equipment',
+            'Plan crop calendar'
+        ],
+        'during_monsoon': [
+            'Monitor water levels in fields',
+            'Watch for pest and disease outbreaks',
+            'Ensure proper drainage',
+            'Apply fertilizers in split doses'
+        ],
+        'post_monsoon': [
+            'Assess crop damage if any',
+            'Plan for winter crops',
+            'Store harvested produce properly'
+        ]
+    },
+    'drought_management': [
+        'Switch to drought-tolerant varieties',
+        'Implement drip irrigation',
+        'Apply mulching to conserve moisture',
+        'Harvest rainwater for irrigation'
+    ],
+    'frost_protection': [
+        'Cover sensitive crops with cloth',
+        'Use smoke to create warm air layer',
+        'Irrigate lightly before frost nights',
+        'Plant windbreaks around fields'
+    ]
+}
+
+# Soil health and management advice
+_SOIL_MANAGEMENT = {
+    'soil_testing': {
+        'frequency': 'Every 2-3 years',
+        'parameters': ['pH', 'N', 'P', 'K', 'organic_matter', 'micronutrients'],
+        'interpretation': {
+            'ph_levels': {
+                'acidic': '<6.0 - Add lime',
+                'neutral': '6.0-7.5 - Optimal for most crops',
+                'alkaline': '>7.5 - Add sulfur or organic matter'
             }
         }
-    
-    def _load_fertilizer_database(self):
-        """Load fertilizer recommendations"""
-        return {
-            'nitrogen_sources': {
-                'urea': {'nitrogen_content': 46, 'application_time': 'Split doses'},
-                'ammonium_sulfate': {'nitrogen_content': 21, 'sulfur_content': 24},
-                'calcium_ammonium_nitrate': {'nitrogen_content': 26, 'calcium_content': 19}
-            },
-            'phosphorus_sources': {
-                'single_super_phosphate': {'phosphorus_content': 16, 'calcium_content': 20},
-                'diammonium_phosphate': {'phosphorus_content': 46, 'nitrogen_content': 18}
-            },
-            'potassium_sources': {
-                'muriate_of_potash': {'potassium_content': 60},
-                'sulfate_of_potash': {'potassium_content': 50, 'sulfur_content': 18}
-            },
-            'organic_fertilizers': {
-                'farmyard_manure': {'npk': '0.5:0.2:0.5', 'application_rate': '10-15 tonnes/ha'},
-                'vermicompost': {'npk': '1.5:1.0:1.5', 'application_rate': '2-3 tonnes/ha'},
-                'green_manure': {'nitrogen_fixation': '50-150 kg N/ha'}
-            }
+    },
+    'organic_matter': {
+        'importance': 'Improves soil structure, water retention, nutrient availability',
+        'sources': ['Crop residues', 'Compost', 'Green manure', 'Animal manure'],
+        'target_level': '2-3% organic matter content'
+    },
+    'conservation_practices': [
+        'Crop rotation to maintain soil fertility',
+        'Cover cropping to prevent erosion',
+        'Contour farming on slopes',
+        'No-till or minimal tillage'
+    ]
+}
+
+# Irrigation management advice
+_IRRIGATION = {
+    'methods': {
+        'drip_irrigation': {
+            'efficiency': '90-95%',
+            'suitable_crops': ['Vegetables', 'Fruits', 'Spices'],
+            'advantages': ['Water saving', 'Precise application', 'Reduced weed growth']
+        },
+        'sprinkler_irrigation': {
+            'efficiency': '75-85%',
+            'suitable_crops': ['Cereals', 'Fodder crops'],
+            'advantages': ['Uniform distribution', 'Labor saving']
         }
+    },
+    'scheduling': {
+        'factors': ['Crop stage', 'Soil type', 'Weather conditions', 'Water availability'],
+        'indicators': ['Soil moisture level', 'Plant appearance', 'Time since last irrigation']
+    }
+}
+
+# Market and price information
+_MARKET_INFO = {
+    'price_trends': {
+        'seasonal_patterns': 'Prices typically higher during off-season',
+        'quality_premiums': 'Premium for organic and certified produce',
+        'market_channels': ['Local mandis', 'Direct sales', 'Contract farming', 'Online platforms']
+    },
+    'post_harvest': {
+        'storage': 'Proper storage can help get better prices',
+        'processing': 'Value addition increases profit margins',
+        'grading': 'Uniform grading fetches better prices'
+    }
+}
+
+# Seasonal farming advice
+_SEASONAL_ADVICE = {
+    'kharif_season': {
+        'months': 'June-November',
+        'major_crops': ['Rice', 'Cotton', 'Sugarcane', 'Maize'],
+        'preparation': [
+            'Prepare fields before monsoon',
+            'Arrange quality seeds',
+            'Plan fertilizer requirements',
+            'Check irrigation facilities'
+        ]
+    },
+    'rabi_season': {
+        'months': 'November-April',
+        'major_crops': ['Wheat', 'Barley', 'Peas', 'Mustard'],
+        'preparation': [
+            'Ensure adequate irrigation',
+            'Plan for frost protection',
+            'Arrange winter varieties',
+            'Prepare for pest management'
+        ]
+    },
+    'zaid_season': {
+        'months': 'April-June',
+        'major_crops': ['Fodder', 'Vegetables', 'Fruits'],
+        'challenges': ['High temperature', 'Water scarcity', 'Pest pressure']
+    }
+}
+
+# Agricultural best practices
+_BEST_PRACTICES = {
+    'integrated_pest_management': [
+        'Regular field monitoring',
+        'Use of beneficial insects',
+        'Crop rotation and diversity',
+        'Judicious use of pesticides'
+    ],
+    'sustainable_agriculture': [
+        'Soil health maintenance',
+        'Water conservation',
+        'Biodiversity preservation',
+        'Reduced chemical inputs'
+    ],
+    'precision_agriculture': [
+        'GPS-guided farming',
+        'Variable rate application',
+        'Sensor-based monitoring',
+        'Data-driven decisions'
+    ]
+}
+
+# Complete knowledge base, built once at import time
+_KB_SOURCE = {
+    'crops': _CROPS,
+    'pests': _PESTS,
+    'diseases': _DISEASES,
+    'fertilizers': _FERTILIZERS,
+    'weather_advice': _WEATHER_ADVICE,
+    'soil_management': _SOIL_MANAGEMENT,
+    'irrigation': _IRRIGATION,
+    'market_info': _MARKET_INFO,
+    'seasonal_advice': _SEASONAL_ADVICE,
+    'best_practices': _BEST_PRACTICES
+}
+
+def _intern_tree(value: Any, shared_lists: Dict[Tuple, List]) -> Any:
+    """Intern every string in a nested value and share one object per distinct list of strings"""
+    value_type = type(value)
+    if value_type is str:
+        return sys.intern(value)
+    if value_type is dict:
+        return {sys.intern(key): _intern_tree(item, shared_lists) for key, item in value.items()}
+    if value_type is list:
+        items = [_intern_tree(item, shared_lists) for item in value]
+        if all(type(item) is str for item in items):
+            return shared_lists.setdefault(tuple(items), items)
+        return items
+    return value
+
+
+_RANGE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)')
+_NPK_RE = re.compile(r'(\d+(?:\.\d+)?):(\d+(?:\.\d+)?):(\d+(?:\.\d+)?)')
+
+def _parse_range(text: str) -> Optional[Tuple[float, float]]:
+    """'5.5-7.0' -> (5.5, 7.0), or None when text holds no range"""
+    match = _RANGE_RE.search(text)
+    return (float(match.group(1)), float(match.group(2))) if match else None
+
+def _parse_npk(text: str) -> Optional[Tuple[float, float, float]]:
+    """'120:60:40 kg/hectare' -> (120.0, 60.0, 40.0), or None when text holds no ratio"""
+    match = _NPK_RE.search(text)
+    return tuple(float(part) for part in match.groups()) if match else None
+
+# Crop fields parsed once into numbers, stored next to the raw text as '<field>_num'
+_NUMERIC_CROP_FIELDS = {
+    'ph_range': _parse_range,
+    'temperature': _parse_range,
+    'fertilizer_npk': _parse_npk,
+}
+
+def _add_numeric_fields(crops: Dict[str, Dict]) -> None:
+    """Store the parsed form of each numeric crop field alongside its raw text"""
+    for crop in crops.values():
+        for field, parse in _NUMERIC_CROP_FIELDS.items():
+            parsed = parse(crop[field]) if field in crop else None
+            if parsed is not None:
+                crop[field + '_num'] = parsed
+
+
+def _build_knowledge_base() -> Dict:
+    """Knowledge base built from the literals above, ready for lookups and indexing"""
+    # Intern keys and advice strings so equal strings are one object and match on identity
+    kb = _intern_tree(_KB_SOURCE, {})
+    _add_numeric_fields(kb['crops'])
+    return kb
+
+class _FrozenDict(dict):
+    """A dict that refuses mutation, safe to hand out as a shared value"""
     
-    def _load_weather_advice(self):
-        """Load weather-based agricultural advice"""
-        return {
-            'monsoon_preparation': {
-                'pre_monsoon': [
-                    'Prepare drainage channels',
-                    'Stock quality seeds and fertilizers',
-                    'Repair farm equipment',
-                    'Plan crop calendar'
-                ],
-                'during_monsoon': [
-                    'Monitor water levels in fields',
-                    'Watch for pest and disease outbreaks',
-                    'Ensure proper drainage',
-                    'Apply fertilizers in split doses'
-                ],
-                'post_monsoon': [
-                    'Assess crop damage if any',
-                    'Plan for winter crops',
-                    'Store harvested produce properly'
-                ]
-            },
-            'drought_management': [
-                'Switch to drought-tolerant varieties',
-                'Implement drip irrigation',
-                'Apply mulching to conserve moisture',
-                'Harvest rainwater for irrigation'
-            ],
-            'frost_protection': [
-                'Cover sensitive crops with cloth',
-                'Use smoke to create warm air layer',
-                'Irrigate lightly before frost nights',
-                'Plant windbreaks around fields'
-            ]
-        }
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
     
-    def _load_soil_management(self):
-        """Load soil health and management advice"""
-        return {
-            'soil_testing': {
-                'frequency': 'Every 2-3 years',
-                'parameters': ['pH', 'N', 'P', 'K', 'organic_matter', 'micronutrients'],
-                'interpretation': {
-                    'ph_levels': {
-                        'acidic': '<6.0 - Add lime',
-                        'neutral': '6.0-7.5 - Optimal for most crops',
-                        'alkaline': '>7.5 - Add sulfur or organic matter'
-                    }
-                }
-            },
-            'organic_matter': {
-                'importance': 'Improves soil structure, water retention, nutrient availability',
-                'sources': ['Crop residues', 'Compost', 'Green manure', 'Animal manure'],
-                'target_level': '2-3% organic matter content'
-            },
-            'conservation_practices': [
-                'Crop rotation to maintain soil fertility',
-                'Cover cropping to prevent erosion',
-                'Contour farming on slopes',
-                'No-till or minimal tillage'
-            ]
-        }
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+# Returned for every missed lookup; still a dict, so jsonify/orjson serialize it as {}
+_EMPTY = _FrozenDict()
+
+def _normalize_name(name: str) -> str:
+    """Lowercase a lookup name, skipping the copy when it is already lowercase ASCII"""
+    return name if name.isascii() and name.islower() else name.lower()
+
+# Search scoring: query words found in an entry's key or content, plus a bonus
+# when the whole query is the key (an exact key match scores 100 + content)
+KEY_MATCH_SCORE = 50
+CONTENT_MATCH_SCORE = 10
+EXACT_KEY_BONUS = 50
+MIN_FRAGMENT_LENGTH = 4  # shorter unknown words are not substring-scanned
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Words too common to tell which entry a query is about; they are neither indexed nor searched
+SEARCH_STOPWORDS = frozenset({
+    'a', 'about', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from',
+    'get', 'has', 'have', 'how', 'i', 'if', 'in', 'into', 'is', 'it', 'its', 'me', 'my', 'need', 'of', 'on',
+    'or', 'our', 'please', 'should', 'so', 'tell', 'that', 'the', 'their', 'them', 'there', 'these', 'this',
+    'to', 'use', 'was', 'we', 'what', 'when', 'where', 'which', 'who', 'why', 'will', 'with', 'you', 'your'
+})
+MIN_TERM_LENGTH = 2  # single letters (e.g. from split non-ASCII words) are not searched either
+
+def _terms(text: str) -> List[str]:
+    """Distinct searchable words of lowercased text, in order of first appearance"""
+    return [word for word in dict.fromkeys(_TOKEN_RE.findall(text))
+            if len(word) >= MIN_TERM_LENGTH and word not in SEARCH_STOPWORDS]
+
+def _leaf_strings(value: Any) -> List[str]:
+    """Collect every string leaf of a nested dict/list value in document order"""
+    leaves = []
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        item_type = type(item)
+        if item_type is str:
+            leaves.append(item)
+        elif item_type is dict:
+            stack.extend(reversed(item.values()))
+        elif item_type is list:
+            stack.extend(reversed(item))
+        elif item_type is tuple:
+            continue  # parsed '<field>_num' values; their raw text is indexed already
+        else:
+            leaves.append(str(item))
+    return leaves
+
+# (entry ids, score contributions) for one word; ids are unique within a posting list
+Postings = Tuple['np.ndarray', 'np.ndarray']
+
+def _to_postings(scores: Dict[int, float]) -> Postings:
+    """Pack an {entry id: score} dict into parallel int32/float32 arrays"""
+    import numpy as np
+    ids = np.fromiter(scores.keys(), dtype=np.int32, count=len(scores))
+    weights = np.fromiter(scores.values(), dtype=np.float32, count=len(scores))
+    return ids, weights
+
+def _accumulate_numpy(ids: 'np.ndarray', weights: 'np.ndarray', totals: 'np.ndarray') -> 'np.ndarray':
+    """NumPy fallback: add every (id, weight) posting into totals"""
+    import numpy as np
+    totals += np.bincount(ids, weights=weights, minlength=len(totals))
+    return totals
+
+def _accumulate_loop(ids, weights, totals):
+    """Add every (id, weight) posting into totals in one loop, compiled by numba"""
+    for j in range(ids.shape[0]):
+        totals[ids[j]] += weights[j]
+    return totals
+
+@lru_cache(maxsize=None)
+def _accumulator():
+    """Scoring kernel: the numba-compiled loop when numba is installed, else the NumPy fallback"""
+    try:
+        from numba import njit
+    except ImportError:
+        return _accumulate_numpy
+    # Serial on purpose: postings of different words hit the same entries, so a
+    # parallel loop would race on totals
+    return njit(cache=True)(_accumulate_loop)
+
+def _pack(texts: List[str]) -> Tuple[str, array]:
+    """Join texts with NUL separators and return the corpus with each text's start offset"""
+    offsets = array('I', [0])
+    for text in texts:
+        offsets.append(offsets[-1] + len(text) + 1)
+    return '\0'.join(texts) + '\0', offsets
+
+class _SearchIndex:
+    """Inverted index from lowercase word to the knowledge base entries containing it"""
     
-    def _load_irrigation_advice(self):
-        """Load irrigation management advice"""
-        return {
-            'methods': {
-                'drip_irrigation': {
-                    'efficiency': '90-95%',
-                    'suitable_crops': ['Vegetables', 'Fruits', 'Spices'],
-                    'advantages': ['Water saving', 'Precise application', 'Reduced weed growth']
-                },
-                'sprinkler_irrigation': {
-                    'efficiency': '75-85%',
-                    'suitable_crops': ['Cereals', 'Fodder crops'],
-                    'advantages': ['Uniform distribution', 'Labor saving']
-                }
-            },
-            'scheduling': {
-                'factors': ['Crop stage', 'Soil type', 'Weather conditions', 'Water availability'],
-                'indicators': ['Soil moisture level', 'Plant appearance', 'Time since last irrigation']
-            }
-        }
+    def __init__(self, kb: Dict, vocabulary: Optional[List[str]] = None):
+        self.entries = []          # (category, key, value) per entry id
+        keys_lower = []            # lowercased key per entry id
+        texts = []                 # lowercased, flattened content per entry id
+        self.key_ids = {}          # lowercased key -> entry ids, for the exact-match bonus
+        postings = {}              # word -> {entry id: score contribution}
+        
+        for category, category_data in kb.items():
+            for key, value in category_data.items():
+                entry_id = len(self.entries)
+                self.entries.append((category, key, value))
+                keys_lower.append(key.lower())
+                texts.append(' '.join(_leaf_strings(value)).lower())
+                self.key_ids.setdefault(keys_lower[entry_id], []).append(entry_id)
+                
+                for word in _terms(texts[entry_id]):
+                    postings.setdefault(word, {})[entry_id] = CONTENT_MATCH_SCORE
+                for word in _terms(keys_lower[entry_id]):
+                    word_postings = postings.setdefault(word, {})
+                    word_postings[entry_id] = word_postings.get(entry_id, 0) + KEY_MATCH_SCORE
+        
+        self.postings = {word: _to_postings(scores) for word, scores in postings.items()}
+        if vocabulary is not None:
+            # A category index keeps the full vocabulary, with empty postings for words found only
+            # in other categories, so its prefix and substring fallbacks fire just as a full search's
+            empty = _to_postings({})
+            for word in vocabulary:
+                self.postings.setdefault(word, empty)
+        
+        # Structure-of-arrays text layout for substring scans: all entries' text in one
+        # string plus an array of start offsets, instead of one object per entry
+        self.text_corpus, self.text_offsets = _pack(texts)
+        self.key_corpus, self.key_offsets = _pack(keys_lower)
+        
+        # Sorted vocabulary and keys: a prefix is a contiguous range found by bisection
+        self.vocabulary = sorted(self.postings)
+        self.sorted_keys = {category: sorted(category_data) for category, category_data in kb.items()}
     
-    def _load_market_info(self):
-        """Load market and price information"""
-        return {
-            'price_trends': {
-                'seasonal_patterns': 'Prices typically higher during off-season',
-                'quality_premiums': 'Premium for organic and certified produce',
-                'market_channels': ['Local mandis', 'Direct sales', 'Contract farming', 'Online platforms']
-            },
-            'post_harvest': {
-                'storage': 'Proper storage can help get better prices',
-                'processing': 'Value addition increases profit margins',
-                'grading': 'Uniform grading fetches better prices'
-            }
-        }
+    def __getstate__(self) -> Dict:
+        # Pickle the posting lists as two flat buffers plus offsets rather than two arrays per
+        # word, as plain bytes so that unpickling the index does not import NumPy
+        import numpy as np
+        postings = self.postings
+        state = {name: value for name, value in self.__dict__.items() if name not in ('postings', '_packed_postings')}
+        words = list(postings)
+        lengths = [len(postings[word][0]) for word in words]
+        state['_packed_postings'] = (
+            words,
+            np.concatenate([postings[word][0] for word in words]).tobytes(),
+            np.concatenate([postings[word][1] for word in words]).tobytes(),
+            np.cumsum([0] + lengths).tolist(),
+        )
+        return state
     
-    def _load_seasonal_advice(self):
-        """Load seasonal farming advice"""
+    @cached_property
+    def postings(self) -> Dict[str, Postings]:
+        """Posting lists of an unpickled index, unpacked on first search"""
+        import numpy as np
+        words, ids, weights, offsets = self._packed_postings
+        ids = np.frombuffer(ids, dtype=np.int32)
+        weights = np.frombuffer(weights, dtype=np.float32)
         return {
-            'kharif_season': {
-                'months': 'June-November',
-                'major_crops': ['Rice', 'Cotton', 'Sugarcane', 'Maize'],
-                'preparation': [
-                    'Prepare fields before monsoon',
-                    'Arrange quality seeds',
-                    'Plan fertilizer requirements',
-                    'Check irrigation facilities'
-                ]
-            },
-            'rabi_season': {
-                'months': 'November-April',
-                'major_crops': ['Wheat', 'Barley', 'Peas', 'Mustard'],
-                'preparation': [
-                    'Ensure adequate irrigation',
-                    'Plan for frost protection',
-                    'Arrange winter varieties',
-                    'Prepare for pest management'
-                ]
-            },
-            'zaid_season': {
-                'months': 'April-June',
-                'major_crops': ['Fodder', 'Vegetables', 'Fruits'],
-                'challenges': ['High temperature', 'Water scarcity', 'Pest pressure']
-            }
+            word: (ids[offsets[i]:offsets[i + 1]], weights[offsets[i]:offsets[i + 1]])
+            for i, word in enumerate(words)
         }
     
-    def _load_best_practices(self):
-        """Load agricultural best practices"""
-        return {
-            'integrated_pest_management': [
-                'Regular field monitoring',
-                'Use of beneficial insects',
-                'Crop rotation and diversity',
-                'Judicious use of pesticides'
-            ],
-            'sustainable_agriculture': [
-                'Soil health maintenance',
-                'Water conservation',
-                'Biodiversity preservation',
-                'Reduced chemical inputs'
-            ],
-            'precision_agriculture': [
-                'GPS-guided farming',
-                'Variable rate application',
-                'Sensor-based monitoring',
-                'Data-driven decisions'
-            ]
-        }
+    @staticmethod
+    def _prefix_range(words: List[str], prefix: str) -> List[str]:
+        """All words in a sorted list that start with prefix"""
+        start = bisect_left(words, prefix)
+        end = bisect_left(words, prefix + '\uffff', start)
+        return words[start:end]
+    
+    def completions(self, prefix: str) -> List[str]:
+        """Indexed words starting with prefix"""
+        return self._prefix_range(self.vocabulary, prefix)
+    
+    def prefix_postings(self, prefix: str) -> Optional[Postings]:
+        """Best score per entry over every indexed word starting with prefix"""
+        words = self.completions(prefix)
+        if not words:
+            return None
+        import numpy as np
+        merged = np.zeros(len(self.entries), dtype=np.float32)
+        for word in words:
+            ids, weights = self.postings[word]
+            merged[ids] = np.maximum(merged[ids], weights)
+        ids = np.flatnonzero(merged).astype(np.int32)
+        return ids, merged[ids]
+    
+    @staticmethod
+    def _scan(corpus: str, offsets: array, fragment: str) -> List[int]:
+        """Ids of the packed entries containing fragment, in one pass over the corpus"""
+        entry_ids = []
+        position = corpus.find(fragment)
+        while position != -1:
+            entry_id = bisect_right(offsets, position) - 1
+            entry_ids.append(entry_id)
+            position = corpus.find(fragment, offsets[entry_id + 1])
+        return entry_ids
+    
+    def fragment_postings(self, fragment: str) -> Postings:
+        """Substring-match a word missing from the index against every entry's packed text"""
+        scores = dict.fromkeys(self._scan(self.text_corpus, self.text_offsets, fragment), CONTENT_MATCH_SCORE)
+        scores.update(dict.fromkeys(self._scan(self.key_corpus, self.key_offsets, fragment), KEY_MATCH_SCORE))
+        return _to_postings(scores)
+
+# Prebuilt knowledge base and search index, written by build_knowledge_base_blob.py
+KB_BLOB_PATH = Path(__file__).with_suffix('.pkl')
+
+def _source_digest() -> str:
+    """Digest of this module's source; a blob built from any other source is stale"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+def _load_blob() -> Optional[Dict]:
+    """Unpickle KB_BLOB_PATH through a read-only mmap, or None when it is missing, unreadable or stale"""
+    try:
+        with open(KB_BLOB_PATH, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            blob = pickle.loads(view)
+    except Exception:
+        return None
+    return blob if blob.get('source_digest') == _source_digest() else None
+
+_BLOB = _load_blob()
+_KB = _BLOB['kb'] if _BLOB else _build_knowledge_base()
+
+# Weather keywords in priority order: every alternative looks ahead over the whole
+# condition, so an earlier group wins wherever its keyword appears
+_WEATHER_RE = re.compile(
+    r'(?=.*?(?P<monsoon>rain|monsoon))|(?=.*?(?P<drought>drought|dry))|(?=.*?(?P<frost>frost|cold))',
+    re.IGNORECASE | re.DOTALL
+)
+_WEATHER_MAP = {
+    'monsoon': _WEATHER_ADVICE['monsoon_preparation']['during_monsoon'],
+    'drought': _WEATHER_ADVICE['drought_management'],
+    'frost': _WEATHER_ADVICE['frost_protection']
+}
+
+# Season for each month, indexed directly by month number (index 0 unused)
+_SEASON_BY_MONTH = (
+    None,
+    'rabi_season', 'rabi_season', 'rabi_season', 'rabi_season',      # Jan-Apr
+    'zaid_season',                                                    # May
+    'kharif_season', 'kharif_season', 'kharif_season',                # Jun-Aug
+    'kharif_season', 'kharif_season', 'kharif_season',                # Sep-Nov
+    'rabi_season'                                                     # Dec
+)
+
+MONTH_CACHE_TTL_S = 3600
+_MONTH_CACHE = [0.0, 0]  # [monotonic expiry, month]
+
+def _current_month() -> int:
+    """Current month, re-read from the clock at most once per MONTH_CACHE_TTL_S"""
+    now = time.monotonic()
+    if now >= _MONTH_CACHE[0]:
+        _MONTH_CACHE[:] = (now + MONTH_CACHE_TTL_S, datetime.now().month)
+    return _MONTH_CACHE[1]
+
+@lru_cache(maxsize=None)
+def _search_index(category: Optional[str] = None) -> _SearchIndex:
+    """Build the index over one category, or the whole knowledge base, on first use"""
+    if category:
+        index = _SearchIndex({category: _KB[category]}, _search_index().vocabulary)
+    else:
+        index = _BLOB['index'] if _BLOB else _SearchIndex(_KB)
+    # Compile the scoring kernel now rather than on the first query
+    import numpy as np
+    _accumulator()(np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32), np.zeros(1, dtype=np.float32))
+    return index
+
+@lru_cache(maxsize=None)
+def _crop_ranges(field: str) -> Tuple[List[str], 'np.ndarray']:
+    """Crop names and their parsed (low, high) bounds for a range field as an (n, 2) matrix"""
+    import numpy as np
+    names = [name for name, crop in _KB['crops'].items() if field + '_num' in crop]
+    bounds = np.array([_KB['crops'][name][field + '_num'] for name in names], dtype=np.float32).reshape(-1, 2)
+    return names, bounds
+
+@lru_cache(maxsize=1024)
+def _lookup(category: str, name: str) -> Dict:
+    """Memoized entry lookup by (possibly mixed-case) name"""
+    return _KB[category].get(_normalize_name(name), _EMPTY)
+
+@lru_cache(maxsize=1024)
+def _search(query_lower: str, category: Optional[str]) -> Tuple[Dict, ...]:
+    """Top 10 entries of one category's index (or the full index) for a lowercased query, memoized"""
+    import numpy as np
+    index = _search_index(category)
+    matched_ids = []
+    matched_weights = []
+    
+    # Gather the postings of every query word, then sum them in one pass
+    for word in _terms(query_lower):
+        postings = index.postings.get(word)
+        if postings is None:
+            if len(word) < MIN_FRAGMENT_LENGTH:
+                continue
+            # Complete word prefixes ("aphid" -> "aphids") before scanning for substrings
+            postings = index.prefix_postings(word)
+            if postings is None:
+                postings = index.fragment_postings(word)
+        matched_ids.append(postings[0])
+        matched_weights.append(postings[1])
+    
+    totals = np.zeros(len(index.entries), dtype=np.float32)
+    if matched_ids:
+        _accumulator()(np.concatenate(matched_ids), np.concatenate(matched_weights), totals)
+    
+    for entry_id in index.key_ids.get('_'.join(query_lower.split()), ()):
+        totals[entry_id] += EXACT_KEY_BONUS
+    
+    # Top 10 matching entries by score, ties in knowledge base order
+    scores = totals.tolist()
+    ranked = heapq.nlargest(10, totals.nonzero()[0].tolist(), key=scores.__getitem__)
+    
+    results = []
+    for entry_id in ranked:
+        cat, key, value = index.entries[entry_id]
+        results.append({
+            'category': cat,
+            'key': key,
+            'data': value,
+            'relevance_score': scores[entry_id]
+        })
+    return tuple(results)
+
+class AgriculturalKnowledgeBase:
+    """Comprehensive agricultural knowledge base for intelligent advisory"""
+    
+    def __init__(self):
+        # The knowledge base is built (or loaded from the blob) once at import and shared by every instance
+        self.knowledge_base = _KB
     
     def get_crop_info(self, crop_name: str) -> Dict:
         """Get comprehensive crop information"""
-        return self.knowledge_base['crops'].get(crop_name.lower(), {})
+        return _lookup('crops', crop_name)
     
     def get_pest_info(self, pest_name: str) -> Dict:
         """Get detailed pest information"""
-        return self.knowledge_base['pests'].get(pest_name.lower(), {})
+        return _lookup('pests', pest_name)
     
     def get_disease_info(self, disease_name: str) -> Dict:
         """Get disease information"""
-        return self.knowledge_base['diseases'].get(disease_name.lower(), {})
+        return _lookup('diseases', disease_name)
     
     def search_knowledge(self, query: str, category: str = None) -> List[Dict]:
         """Search across the knowledge base"""
-        results = []
-        query_lower = query.lower()
-        
-        search_categories = [category] if category else self.knowledge_base.keys()
-        
-        for cat in search_categories:
-            if cat in self.knowledge_base:
-                category_data = self.knowledge_base[cat]
-                for key, value in category_data.items():
-                    if query_lower in key.lower() or self._search_in_value(query_lower, value):
-                        results.append({
-                            'category': cat,
-                            'key': key,
-                            'data': value,
-                            'relevance_score': self._calculate_relevance(query_lower, key, value)
-                        })
-        
-        # Sort by relevance score
-        results.sort(key=lambda x: x['relevance_score'], reverse=True)
-        return results[:10]  # Return top 10 results
+        if category:
+            return self.search_category(query, category)
+        return self.search_all(query)
     
-    def _search_in_value(self, query: str, value: Any) -> bool:
-        """Search within nested dictionary/list values"""
-        if isinstance(value, dict):
-            return any(query in str(v).lower() for v in value.values())
-        elif isinstance(value, list):
-            return any(query in str(item).lower() for item in value)
-        elif isinstance(value, str):
-            return query in value.lower()
-        return False
+    def search_category(self, query: str, category: str) -> List[Dict]:
+        """Search the entries of a single category"""
+        if category not in _KB:
+            return []
+        # Results are cached, so hand each caller its own copies
+        return [dict(result) for result in _search(query.lower(), category)]
     
-    def _calculate_relevance(self, query: str, key: str, value: Any) -> float:
-        """Calculate relevance score for search results"""
-        score = 0.0
-        
-        # Higher score for exact key match
-        if query == key.lower():
-            score += 100
-        elif query in key.lower():
-            score += 50
-        
-        # Score for content matches
-        content_str = str(value).lower()
-        query_words = query.split()
-        for word in query_words:
-            if word in content_str:
-                score += 10
-        
-        return score
+    def search_all(self, query: str) -> List[Dict]:
+        """Search every category"""
+        return [dict(result) for result in _search(query.lower(), None)]
+    
+    def search_terms(self, query: str) -> List[str]:
+        """The words of a query that searches score entries on"""
+        return _terms(query.lower())
+    
+    def complete_name(self, prefix: str, category: str = 'crops') -> List[str]:
+        """Keys in a category that start with prefix, e.g. "ric" -> ["rice"]"""
+        sorted_keys = _search_index().sorted_keys.get(category, [])
+        return _SearchIndex._prefix_range(sorted_keys, prefix.lower())
+    
+    def find_crops_by_ph(self, ph: float) -> List[str]:
+        """Crops whose pH range includes ph"""
+        return self._crops_within('ph_range', ph)
+    
+    def find_crops_by_temperature(self, temperature: float) -> List[str]:
+        """Crops whose temperature range (°C) includes temperature"""
+        return self._crops_within('temperature', temperature)
+    
+    def _crops_within(self, field: str, value: float) -> List[str]:
+        """Crops whose parsed range field includes value"""
+        names, bounds = _crop_ranges(field)
+        inside = (bounds[:, 0] <= value) & (value <= bounds[:, 1])
+        return [names[i] for i in inside.nonzero()[0]]
     
     def get_seasonal_advice(self, month: int = None) -> Dict:
         """Get seasonal advice based on current month"""
         if month is None:
-            month = datetime.now().month
+            month = _current_month()
         
-        if month in [6, 7, 8, 9, 10, 11]:
-            return self.knowledge_base['seasonal_advice']['kharif_season']
-        elif month in [11, 12, 1, 2, 3, 4]:
-            return self.knowledge_base['seasonal_advice']['rabi_season']
-        else:
-            return self.knowledge_base['seasonal_advice']['zaid_season']
+        season = _SEASON_BY_MONTH[month] if 1 <= month <= 12 else 'zaid_season'
+        return self.knowledge_base['seasonal_advice'][season]
     
     def get_weather_advice(self, weather_condition: str) -> List[str]:
         """Get weather-specific advice"""
-        weather_advice = self.knowledge_base['weather_advice']
-        
-        if 'rain' in weather_condition.lower() or 'monsoon' in weather_condition.lower():
-            return weather_advice['monsoon_preparation']['during_monsoon']
-        elif 'drought' in weather_condition.lower() or 'dry' in weather_condition.lower():
-            return weather_advice['drought_management']
-        elif 'frost' in weather_condition.lower() or 'cold' in weather_condition.lower():
-            return weather_advice['frost_protection']
-        
-        return []
\ No newline at end of file
+        match = _WEATHER_RE.match(weather_condition)
+        return _WEATHER_MAP[match.lastgroup] if match else []
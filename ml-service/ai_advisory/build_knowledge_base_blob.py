@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Prebuild the agricultural knowledge base and its search index into a pickle blob
+agricultural_knowledge_base loads the blob at import instead of rebuilding both, as long as
+the module source is unchanged; rerun this script after editing the knowledge base
+"""
+
+import pickle
+import logging
+import argparse
+import pickletools
+from pathlib import Path
+
+import agricultural_knowledge_base as kb_module
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def build(output_path: Path) -> Path:
+    """Pickle the built knowledge base and full search index with the source digest they came from"""
+    blob = {
+        'source_digest': kb_module._source_digest(),
+        'kb': kb_module._KB,
+        'index': kb_module._search_index(),
+    }
+    data = pickletools.optimize(pickle.dumps(blob, protocol=5))
+    output_path.write_bytes(data)
+    logger.info(f"Knowledge base blob written to {output_path} ({len(data) / 1024:.0f} KB)")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Prebuild the knowledge base blob loaded at import')
+    parser.add_argument('--output', type=Path, default=kb_module.KB_BLOB_PATH,
+                       help='Where to write the blob')
+
+    args = parser.parse_args()
+    build(args.output)
+
+if __name__ == "__main__":
+    main()
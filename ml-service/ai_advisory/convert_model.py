@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Convert the Keras pest detection model to a fully INT8-quantized TFLite model or to ONNX
+The AI Advisory API serves the converted file instead of the Keras model when it exists
+ONNX export needs tf2onnx: pip install -r ../requirements-convert.txt
+"""
+
+import logging
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from _preproc import preprocess_pil_image, MODEL_INPUT_SIZE
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+KERAS_MODEL_PATH = Path('models/pest_detection_model.h5')
+TFLITE_MODEL_PATH = Path('models/pest_detection_model_int8.tflite')
+ONNX_MODEL_PATH = Path('models/pest_detection_model.onnx')
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+def representative_dataset(calibration_dir: Path = None, max_samples: int = 200):
+    """Yield preprocessed samples used to calibrate the INT8 ranges"""
+    images = []
+    if calibration_dir and calibration_dir.is_dir():
+        images = [p for p in sorted(calibration_dir.rglob('*')) if p.suffix.lower() in IMAGE_EXTENSIONS]
+
+    if images:
+        logger.info(f"Calibrating on {min(len(images), max_samples)} images from {calibration_dir}")
+        for path in images[:max_samples]:
+            with Image.open(path) as image:
+                yield [preprocess_pil_image(image)]
+    else:
+        logger.warning("No calibration images found, calibrating on random inputs (accuracy may suffer)")
+        rng = np.random.default_rng(0)
+        for _ in range(max_samples):
+            yield [rng.random((1,) + MODEL_INPUT_SIZE + (3,), dtype=np.float32)]
+
+def convert(keras_path: Path, output_path: Path, calibration_dir: Path = None) -> Path:
+    """Post-training full integer quantization of a Keras model"""
+    import tensorflow as tf
+
+    logger.info(f"Loading Keras model from {keras_path}")
+    model = tf.keras.models.load_model(str(keras_path))
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = lambda: representative_dataset(calibration_dir)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+
+    tflite_model = converter.convert()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(tflite_model)
+    logger.info(f"INT8 model written to {output_path} ({len(tflite_model) / 1024:.0f} KB)")
+    return output_path
+
+def export_onnx(keras_path: Path, output_path: Path, opset: int = 17) -> Path:
+    """Export a Keras model to ONNX with a dynamic batch dimension"""
+    import tensorflow as tf
+    import tf2onnx
+
+    logger.info(f"Loading Keras model from {keras_path}")
+    model = tf.keras.models.load_model(str(keras_path))
+
+    input_signature = [tf.TensorSpec((None,) + MODEL_INPUT_SIZE + (3,), tf.float32, name='input')]
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # from_function also works for Keras 3 models, where tf2onnx's from_keras does not
+    serving_fn = tf.function(lambda x: model(x, training=False))
+    tf2onnx.convert.from_function(serving_fn, input_signature=input_signature, opset=opset, output_path=str(output_path))
+    logger.info(f"ONNX model written to {output_path}")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the pest detection model for faster CPU serving')
+    parser.add_argument('--format', choices=['tflite', 'onnx'], default='tflite',
+                       help='INT8 TFLite model or ONNX model for ONNX Runtime')
+    parser.add_argument('--model', type=Path, default=KERAS_MODEL_PATH,
+                       help='Keras model to convert')
+    parser.add_argument('--output', type=Path, default=None,
+                       help='Where to write the converted model')
+    parser.add_argument('--calibration-dir', type=Path, default=None,
+                       help='Directory of sample images used to calibrate quantization ranges')
+
+    args = parser.parse_args()
+    if args.format == 'onnx':
+        export_onnx(args.model, args.output or ONNX_MODEL_PATH)
+    else:
+        convert(args.model, args.output or TFLITE_MODEL_PATH, args.calibration_dir)
+
+if __name__ == "__main__":
+    main()
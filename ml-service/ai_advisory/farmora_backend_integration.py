@@ -4,64 +4,313 @@ Farmora Backend Integration Controller
 Example implementation for integrating AI Advisory with your main backend
 """
 
-import requests
+import os
 import json
 import base64
+import hashlib
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import time
+import socket
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Any, Awaitable, Iterator, Union, TypedDict
 import asyncio
 import aiohttp
+from aiohttp.compression_utils import HAS_ZSTD
+from yarl import URL
 from pathlib import Path
 import io
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # libuv event loop: fewer syscalls and less overhead per socket operation
+except ImportError:
+    uvloop = None
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+# Ask the AI service for compressed responses; aiohttp decodes zstd only when a zstd backend is installed
+ACCEPT_ENCODING = 'zstd, gzip' if HAS_ZSTD else 'gzip'
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The AI service resizes every image to 224x224 after decoding at no less than twice that,
+# so larger uploads only cost bandwidth and decode time upstream
+UPLOAD_MIN_SIDE = 448
+UPLOAD_JPEG_QUALITY = 85
+MAX_IMAGES_PER_REQUEST = 8
+
+# Leading bytes of each accepted image format; a file's extension is whatever the uploader chose
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'BM', 'bmp'),
+)
+_SUPPORTED_IMAGE_FORMATS = ', '.join(dict.fromkeys(name for _, name in _IMAGE_SIGNATURES))
+
+# Seasonal advice changes at most once a month, so dashboards can share one upstream response
+SEASONAL_CACHE_TTL_S = 3600
+
+# Shapes of the AI service's responses, so handlers index the keys they know are there
+class ChatReply(TypedDict, total=False):
+    """The 'response' object of a /api/chat reply"""
+    message: str
+    recommendations: List[str]
+    follow_up_questions: List[str]
+    confidence: float
+    intent: str
+    session_info: Dict[str, Any]
+
+class ChatHistory(TypedDict, total=False):
+    """The 'data' object of a /api/chat/history reply; only 'error' when the user has no session"""
+    session_id: str
+    message_count: int
+    conversation_history: List[Dict[str, Any]]
+    created_at: str
+    last_active: str
+    error: str
+
+class AdvisoryResult(TypedDict, total=False):
+    """What _make_request returns: the decoded response body as 'data' on success, 'error' otherwise"""
+    success: bool
+    data: Dict[str, Any]
+    error: str
+    status_code: int
+
+# Context sent with every chat message; the caller's request fields and context override it
+_CHAT_CONTEXT_TEMPLATE = {'timestamp': None, 'user_agent': '', 'platform': 'web'}
+
+def _dumps(obj) -> str:
+    """JSON-encode a multipart form field"""
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+def _tuned_socket(addr_info) -> socket.socket:
+    """Socket factory for the AI service connector: Nagle off, TCP keepalive probes on"""
+    family, type_, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Detect a dead pooled connection within ~1.5 minutes rather than the OS default of hours
+    for option, value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3)):
+        if hasattr(socket, option):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+    return sock
+
+def _downscale_bytes(data: bytes) -> bytes:
+    """Re-encode image bytes as a JPEG no larger than the AI service needs (runs in the image pool)"""
+    # Ignore EXIF orientation, as the AI service does when it decodes with PIL
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+    if img is None:
+        # Anything OpenCV cannot decode goes upstream untouched for the AI service to judge
+        return data
+    
+    height, width = img.shape[:2]
+    scale = UPLOAD_MIN_SIDE / min(height, width)
+    if scale >= 1:
+        return data
+    
+    img = cv2.resize(img, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, UPLOAD_JPEG_QUALITY])
+    return encoded.tobytes() if ok else data
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """A uvloop event loop when uvloop is installed, else asyncio's default loop"""
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+def _image_head(image_file, size: int = 12) -> bytes:
+    """First bytes of an upload (file object or raw bytes), leaving a file's position unchanged"""
+    if isinstance(image_file, (bytes, bytearray, memoryview)):
+        return bytes(image_file[:size])
+    position = image_file.tell()
+    head = image_file.read(size)
+    image_file.seek(position)
+    return head
+
+TIMESTAMP_RESOLUTION_S = 0.001
+_TIMESTAMP_CACHE = [0.0, '']  # [monotonic expiry, ISO timestamp]
+
+def _cached_timestamp() -> str:
+    """Current ISO timestamp, formatted at most once per TIMESTAMP_RESOLUTION_S"""
+    now = time.monotonic()
+    if now >= _TIMESTAMP_CACHE[0]:
+        _TIMESTAMP_CACHE[:] = (now + TIMESTAMP_RESOLUTION_S, datetime.now().isoformat())
+    return _TIMESTAMP_CACHE[1]
+
 class FarmoraAIAdvisoryClient:
     """
     Client for integrating with Farmora AI Advisory API
     Use this in your main backend to communicate with the AI service
+    
+    All requests share one aiohttp session (and its keep-alive connection pool),
+    created on first use. A session belongs to the event loop that created it:
+    async frameworks await the methods directly on their own loop, while
+    synchronous code goes through run_sync, which uses the client's own loop thread.
     """
     
-    def __init__(self, api_base_url: str = "http://localhost:5002"):
+    def __init__(self, api_base_url: str = "http://localhost:5002", pool_size: int = 100):
         self.api_base_url = api_base_url
         self.timeout = 30
+        self.pool_size = pool_size
+        self._session = None
+        self._methods = {}
+        self._seasonal_cache = {}  # month -> (expires_at, task)
+        self._inflight_chats = {}  # (user_id, message, image digest, location JSON, context JSON) -> task
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        
+        # Endpoint URLs built once; the session uses URL objects as-is instead of parsing a string per request
+        self._health_url = URL(f"{api_base_url}/health")
+        self._chat_url = URL(f"{api_base_url}/api/chat")
+        self._history_url = URL(f"{api_base_url}/api/chat/history")
+        self._analyze_url = URL(f"{api_base_url}/api/advisory/analyze-image")
+        self._search_url = URL(f"{api_base_url}/api/advisory/knowledge-search")
+        self._quick_advice_url = URL(f"{api_base_url}/api/advisory/quick-advice")
+        self._seasonal_url = URL(f"{api_base_url}/api/advisory/seasonal-advice")
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use inside the running event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                auto_decompress=True,
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                    socket_factory=_tuned_socket
+                )
+            )
+            # Bound request methods, looked up by name instead of comparing method strings per call
+            self._methods = {'GET': self._session.get, 'POST': self._session.post}
+        return self._session
+    
+    async def open(self):
+        """Create the shared session now, e.g. in an application's startup hook"""
+        self._get_session()
+    
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def run_sync(self, coro: Awaitable) -> Any:
+        """Run a coroutine to completion from synchronous code (Flask, Django, scripts)"""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = _new_event_loop()
+                    threading.Thread(target=loop.run_forever, name='farmora-ai-client', daemon=True).start()
+                    self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
         
-    def _make_request(self, endpoint: str, method: str = "GET", data: dict = None) -> dict:
-        """Make HTTP request to AI advisory API"""
-        url = f"{self.api_base_url}{endpoint}"
+    @staticmethod
+    def _body(data: dict = None, form: aiohttp.FormData = None) -> dict:
+        """Request body arguments: the multipart form, or data encoded with orjson when installed"""
+        if form is not None:
+            return {'data': form}
+        if orjson is not None:
+            return {'data': orjson.dumps(data), 'headers': JSON_HEADERS}
+        return {'json': data}
+    
+    async def _make_request(self, endpoint: Union[str, URL], method: str = "GET", data: dict = None,
+                            form: aiohttp.FormData = None) -> AdvisoryResult:
+        """Make HTTP request to AI advisory API, with a JSON body or a multipart form"""
+        self._get_session()
+        send = self._methods.get(method)
+        if send is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
         try:
-            if method == "GET":
-                response = requests.get(url, timeout=self.timeout)
-            elif method == "POST":
-                response = requests.post(url, json=data, timeout=self.timeout)
-            
-            response.raise_for_status()
-            return {
-                'success': True,
-                'data': response.json(),
-                'status_code': response.status_code
-            }
+            request = send(endpoint) if data is None and form is None else send(endpoint, **self._body(data, form))
+            async with request as response:
+                response.raise_for_status()
+                return {
+                    'success': True,
+                    'data': orjson.loads(await response.read()) if orjson else await response.json(),
+                    'status_code': response.status
+                }
             
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"API request failed: {e}")
             return {
                 'success': False,
-                'error': str(e),
-                'status_code': getattr(e.response, 'status_code', 0) if hasattr(e, 'response') else 0
+                'error': str(e) or type(e).__name__,
+                'status_code': getattr(e, 'status', 0)
             }
     
-    def check_service_health(self) -> dict:
+    async def check_service_health(self) -> dict:
         """Check if AI advisory service is healthy"""
-        return self._make_request("/health")
+        return await self._make_request(self._health_url)
     
-    def chat_with_ai(self, user_id: str, message: str, image_data: str = None, 
+    async def chat_with_ai(self, user_id: str, message: str, image_data=None, 
                      location: dict = None, context: dict = None) -> dict:
-        """Send chat message to AI advisory"""
+        """Send chat message to AI advisory; image_data is a file object, raw bytes or a base64 string"""
+        if image_data is not None and not isinstance(image_data, (str, bytes, bytearray, memoryview)):
+            # A file object would have to be read whole to compare its content, which streaming avoids
+            return await self._send_chat(user_id, message, image_data, location, context)
+        
+        # Duplicates of a message still in flight (frontend retries, reconnects) share its response
+        key = (
+            user_id, message,
+            hashlib.blake2b(image_data.encode() if isinstance(image_data, str) else image_data).digest()
+            if image_data is not None else None,
+            _dumps(location) if location else None,
+            _dumps(context) if context else None
+        )
+        task = self._inflight_chats.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._send_chat(user_id, message, image_data, location, context))
+            self._inflight_chats[key] = task
+            task.add_done_callback(lambda done: self._finish_chat(key, done))
+        return await asyncio.shield(task)
+    
+    def _finish_chat(self, key: tuple, task: asyncio.Future):
+        """Forget a completed chat request, unless a newer one has taken its key"""
+        if self._inflight_chats.get(key) is task:
+            del self._inflight_chats[key]
+    
+    async def _send_chat(self, user_id: str, message: str, image_data=None,
+                         location: dict = None, context: dict = None) -> dict:
+        """POST a chat message: multipart when there is a raw image, else JSON"""
+        if image_data and not isinstance(image_data, str):
+            # Send the image as a raw multipart file rather than base64 inside the JSON body
+            form = aiohttp.FormData()
+            form.add_field('user_id', user_id)
+            form.add_field('message', message)
+            if location:
+                form.add_field('location', _dumps(location))
+            if context:
+                form.add_field('context', _dumps(context))
+            form.add_field('image', getattr(image_data, 'stream', image_data),
+                           filename=getattr(image_data, 'filename', None) or 'image',
+                           content_type='application/octet-stream')
+            return await self._make_request(self._chat_url, "POST", form=form)
+        
         payload = {
             "user_id": user_id,
             "message": message
@@ -74,34 +323,63 @@ class FarmoraAIAdvisoryClient:
         if context:
             payload["context"] = context
             
-        return self._make_request("/api/chat", "POST", payload)
+        return await self._make_request(self._chat_url, "POST", payload)
     
-    def analyze_crop_image(self, image_data: str) -> dict:
-        """Analyze crop/pest image"""
-        return self._make_request("/api/advisory/analyze-image", "POST", {"image": image_data})
+    async def analyze_crop_image(self, image) -> dict:
+        """Analyze crop/pest image: a file object or raw bytes, or a base64 string"""
+        if isinstance(image, str):
+            return await self._make_request(self._analyze_url, "POST", {"image": image})
+        
+        # Upload the raw bytes as multipart; aiohttp streams file objects in chunks
+        form = aiohttp.FormData()
+        form.add_field('image', getattr(image, 'stream', image),
+                       filename=getattr(image, 'filename', None) or 'image',
+                       content_type='application/octet-stream')
+        return await self._make_request(self._analyze_url, "POST", form=form)
     
-    def search_knowledge(self, query: str, category: str = None) -> dict:
+    async def search_knowledge(self, query: str, category: str = None) -> dict:
         """Search agricultural knowledge base"""
         payload = {"query": query}
         if category:
             payload["category"] = category
-        return self._make_request("/api/advisory/knowledge-search", "POST", payload)
+        return await self._make_request(self._search_url, "POST", payload)
     
-    def get_quick_advice(self, advice_type: str, **kwargs) -> dict:
+    async def get_quick_advice(self, advice_type: str, **kwargs) -> dict:
         """Get quick advice for specific queries"""
         payload = {"type": advice_type, **kwargs}
-        return self._make_request("/api/advisory/quick-advice", "POST", payload)
+        return await self._make_request(self._quick_advice_url, "POST", payload)
+    
+    async def get_seasonal_advice(self, month: int = None) -> dict:
+        """Get seasonal agricultural advice; cached per month, and concurrent callers share one request"""
+        key = month or datetime.now().month
+        now = time.monotonic()
+        cached = self._seasonal_cache.get(key)
+        # A pending task can only be awaited from its own event loop (see run_sync)
+        if cached and cached[0] > now and (cached[1].done() or cached[1].get_loop() is asyncio.get_running_loop()):
+            task = cached[1]
+        else:
+            task = asyncio.ensure_future(self._fetch_seasonal_advice(month))
+            self._seasonal_cache[key] = (now + SEASONAL_CACHE_TTL_S, task)
+            task.add_done_callback(lambda done: self._evict_failed_seasonal_advice(key, done))
+        # Shielded so one caller's cancellation does not cancel the request the others are waiting on
+        return await asyncio.shield(task)
     
-    def get_seasonal_advice(self, month: int = None) -> dict:
-        """Get seasonal agricultural advice"""
-        endpoint = "/api/advisory/seasonal-advice"
+    async def _fetch_seasonal_advice(self, month: int = None) -> dict:
+        """Request seasonal advice from the AI service"""
         if month:
-            endpoint += f"?month={month}"
-        return self._make_request(endpoint)
+            return await self._make_request(self._seasonal_url.with_query(month=month))
+        return await self._make_request(self._seasonal_url)
     
-    def get_chat_history(self, user_id: str) -> dict:
-        """Get conversation history for user"""
-        return self._make_request(f"/api/chat/history/{user_id}")
+    def _evict_failed_seasonal_advice(self, key: int, task: asyncio.Future):
+        """Drop a failed seasonal advice response from the cache so the next call retries"""
+        if task.cancelled() or task.exception() is not None or not task.result()['success']:
+            if self._seasonal_cache.get(key, (None, None))[1] is task:
+                del self._seasonal_cache[key]
+    
+    async def get_chat_history(self, user_id: str, limit: int = None) -> dict:
+        """Get conversation history for user: the last `limit` messages, or the service's default"""
+        url = self._history_url / str(user_id)
+        return await self._make_request(url if limit is None else url.with_query(limit=limit))
 
 class FarmoraBackendController:
     """
@@ -109,9 +387,23 @@ class FarmoraBackendController:
     Example implementation - adapt to your backend framework (Django, Flask, FastAPI, etc.)
     """
     
-    def __init__(self):
-        self.ai_client = FarmoraAIAdvisoryClient()
-        self.supported_image_formats = {'jpg', 'jpeg', 'png', 'gif', 'bmp'}
+    def __init__(self, ai_client: FarmoraAIAdvisoryClient = None):
+        # One client per application, so every handler shares its connection pool
+        self.ai_client = ai_client or FarmoraAIAdvisoryClient()
+        # Worker processes for decoding and resizing uploads, started on first use
+        self._image_pool = None
+        self._image_pool_lock = threading.Lock()
+    
+    def run_sync(self, coro: Awaitable) -> Any:
+        """Run an async handler from synchronous code, e.g. a Flask or Django view"""
+        return self.ai_client.run_sync(coro)
+    
+    async def close(self):
+        """Release the AI client's connections and the image workers at application shutdown"""
+        await self.ai_client.close()
+        if self._image_pool is not None:
+            self._image_pool.shutdown(wait=False, cancel_futures=True)
+            self._image_pool = None
     
     def validate_image(self, image_file) -> tuple[bool, str]:
         """Validate uploaded image"""
@@ -120,29 +412,83 @@ class FarmoraBackendController:
             if hasattr(image_file, 'content_length') and image_file.content_length > 32 * 1024 * 1024:
                 return False, "Image too large. Maximum size is 32MB."
             
-            # Check file extension
-            filename = getattr(image_file, 'filename', '') or getattr(image_file, 'name', '')
-            if filename:
-                ext = filename.lower().split('.')[-1]
-                if ext not in self.supported_image_formats:
-                    return False, f"Unsupported image format. Supported: {', '.join(self.supported_image_formats)}"
+            # Check the file signature
+            head = _image_head(image_file)
+            if not any(head.startswith(signature) for signature, _ in _IMAGE_SIGNATURES):
+                return False, f"Unsupported image format. Supported: {_SUPPORTED_IMAGE_FORMATS}"
             
             return True, "Valid image"
             
         except Exception as e:
             return False, f"Image validation failed: {str(e)}"
     
+    def downscale_image(self, image_file):
+        """Decode an upload and re-encode it as a JPEG no larger than the AI service needs"""
+        if cv2 is None:
+            return image_file
+        
+        return _downscale_bytes(image_file.read() if hasattr(image_file, 'read') else image_file)
+    
+    async def downscale_image_async(self, image_file):
+        """downscale_image in a worker process, so decoding a large upload does not stall the event loop"""
+        if cv2 is None:
+            return image_file
+        
+        data = image_file.read() if hasattr(image_file, 'read') else image_file
+        pool = self._get_image_pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, _downscale_bytes, data)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory on a hostile upload) and took the pool with it; start a
+            # fresh pool for later requests and retry this one once
+            logger.warning("Image worker pool broke; restarting it")
+            self._discard_image_pool(pool)
+            pool = self._get_image_pool()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, _downscale_bytes, data)
+            except BrokenProcessPool:
+                self._discard_image_pool(pool)
+                # Send the upload as it came rather than risk this process decoding it inline
+                return data
+    
+    def _get_image_pool(self) -> ProcessPoolExecutor:
+        """The image worker pool, started on first use"""
+        if self._image_pool is None:
+            with self._image_pool_lock:
+                if self._image_pool is None:
+                    # spawn, not fork: the parent runs event-loop threads that a forked child would inherit
+                    # mid-state. Workers re-import the entry script, so it needs an `if __name__ == '__main__'` guard
+                    self._image_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                           mp_context=multiprocessing.get_context('spawn'))
+        return self._image_pool
+    
+    def _discard_image_pool(self, pool: ProcessPoolExecutor):
+        """Shut down a broken pool so the next request starts a new one (unless one already replaced it)"""
+        with self._image_pool_lock:
+            if self._image_pool is pool:
+                self._image_pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def process_image_stream(self, image_file, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the image base64-encoded chunk by chunk, never reading the whole file at once"""
+        if not hasattr(image_file, 'read'):
+            image_file = io.BytesIO(image_file)
+        
+        # Encode whole 3-byte groups only, so no padding lands in the middle of the stream
+        pending = b''
+        while chunk := image_file.read(chunk_size):
+            chunk = pending + chunk
+            cut = len(chunk) - len(chunk) % 3
+            pending = chunk[cut:]
+            yield base64.b64encode(chunk[:cut])
+        if pending:
+            yield base64.b64encode(pending)
+    
     def process_image_to_base64(self, image_file) -> str:
         """Convert image file to base64 string"""
         try:
-            # Read image data
-            if hasattr(image_file, 'read'):
-                image_data = image_file.read()
-            else:
-                image_data = image_file
-            
-            # Convert to base64
-            return base64.b64encode(image_data).decode('utf-8')
+            return b''.join(self.process_image_stream(image_file)).decode('ascii')
             
         except Exception as e:
             logger.error(f"Image processing failed: {e}")
@@ -151,7 +497,7 @@ class FarmoraBackendController:
     # === API Endpoint Handlers ===
     # These are example handlers - adapt to your web framework
     
-    def handle_chat_request(self, user_id: str, request_data: dict) -> dict:
+    async def handle_chat_request(self, user_id: str, request_data: dict) -> dict:
         """
         Handle chat request from frontend
         Example for Flask/FastAPI/Django endpoint
@@ -179,18 +525,20 @@ class FarmoraBackendController:
                         'success': False,
                         'error': validation_message
                     }
-                image_data = self.process_image_to_base64(image_file)
+                image_data = await self.downscale_image_async(image_file)
             
             # Prepare additional context
-            enhanced_context = {
-                'timestamp': datetime.now().isoformat(),
-                'user_agent': request_data.get('user_agent', ''),
-                'platform': request_data.get('platform', 'web'),
-                **user_context
-            }
+            enhanced_context = _CHAT_CONTEXT_TEMPLATE.copy()
+            enhanced_context['timestamp'] = _cached_timestamp()
+            if 'user_agent' in request_data:
+                enhanced_context['user_agent'] = request_data['user_agent']
+            if 'platform' in request_data:
+                enhanced_context['platform'] = request_data['platform']
+            if user_context:
+                enhanced_context.update(user_context)
             
             # Call AI advisory service
-            ai_response = self.ai_client.chat_with_ai(
+            ai_response = await self.ai_client.chat_with_ai(
                 user_id=user_id,
                 message=message or "Please analyze this image",
                 image_data=image_data,
@@ -203,7 +551,7 @@ class FarmoraBackendController:
                 logger.info(f"AI chat successful for user {user_id}")
                 
                 # Prepare response for frontend
-                response_data = ai_response['data']['response']
+                response_data: ChatReply = ai_response['data']['response']
                 
                 return {
                     'success': True,
@@ -213,7 +561,7 @@ class FarmoraBackendController:
                     'confidence': response_data.get('confidence', 0.0),
                     'intent': response_data.get('intent', 'general'),
                     'session_info': response_data.get('session_info', {}),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _cached_timestamp()
                 }
             else:
                 # Handle AI service error
@@ -232,7 +580,7 @@ class FarmoraBackendController:
                 'message': 'An unexpected error occurred. Please try again.'
             }
     
-    def handle_image_analysis_request(self, request_data: dict) -> dict:
+    async def handle_image_analysis_request(self, request_data: dict) -> dict:
         """Handle dedicated image analysis request"""
         try:
             image_file = request_data.get('image')
@@ -251,10 +599,8 @@ class FarmoraBackendController:
                     'error': validation_message
                 }
             
-            image_data = self.process_image_to_base64(image_file)
-            
-            # Call AI analysis
-            ai_response = self.ai_client.analyze_crop_image(image_data)
+            # Call AI analysis, uploading the image as multipart rather than base64-encoding it
+            ai_response = await self.ai_client.analyze_crop_image(await self.downscale_image_async(image_file))
             
             if ai_response['success']:
                 return {
@@ -262,7 +608,7 @@ class FarmoraBackendController:
                     'analysis': ai_response['data']['analysis'],
                     'pest_info': ai_response['data'].get('pest_info'),
                     'recommendations': ai_response['data'].get('recommendations', {}),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _cached_timestamp()
                 }
             else:
                 return {
@@ -277,7 +623,33 @@ class FarmoraBackendController:
                 'error': 'Image analysis service unavailable'
             }
     
-    def handle_knowledge_search_request(self, request_data: dict) -> dict:
+    async def handle_batch_image_analysis_request(self, request_data: dict) -> dict:
+        """Handle analysis of several images at once, e.g. a multi-crop submission"""
+        images = request_data.get('images') or []
+        
+        if not images:
+            return {
+                'success': False,
+                'error': 'At least one image is required'
+            }
+        if len(images) > MAX_IMAGES_PER_REQUEST:
+            return {
+                'success': False,
+                'error': f"Too many images. Maximum is {MAX_IMAGES_PER_REQUEST} per request."
+            }
+        
+        # Dispatch every image at once: the AI service batches concurrent analyses into one model call
+        results = await asyncio.gather(*(
+            self.handle_image_analysis_request({'image': image}) for image in images
+        ))
+        
+        return {
+            'success': any(result['success'] for result in results),
+            'results': results,
+            'timestamp': _cached_timestamp()
+        }
+    
+    async def handle_knowledge_search_request(self, request_data: dict) -> dict:
         """Handle knowledge base search request"""
         try:
             query = request_data.get('query', '').strip()
@@ -290,7 +662,7 @@ class FarmoraBackendController:
                 }
             
             # Search knowledge base
-            ai_response = self.ai_client.search_knowledge(query, category)
+            ai_response = await self.ai_client.search_knowledge(query, category)
             
             if ai_response['success']:
                 return {
@@ -298,7 +670,7 @@ class FarmoraBackendController:
                     'query': query,
                     'results': ai_response['data']['results'],
                     'total_results': ai_response['data']['total_results'],
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _cached_timestamp()
                 }
             else:
                 return {
@@ -313,19 +685,19 @@ class FarmoraBackendController:
                 'error': 'Search service unavailable'
             }
     
-    def handle_quick_advice_request(self, request_data: dict) -> dict:
+    async def handle_quick_advice_request(self, request_data: dict) -> dict:
         """Handle quick advice request"""
         try:
             advice_type = request_data.get('type', 'general')
             
             # Call AI advisory
-            ai_response = self.ai_client.get_quick_advice(advice_type, **request_data)
+            ai_response = await self.ai_client.get_quick_advice(advice_type, **request_data)
             
             if ai_response['success']:
                 return {
                     'success': True,
                     'advice': ai_response['data']['advice'],
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _cached_timestamp()
                 }
             else:
                 return {
@@ -340,16 +712,16 @@ class FarmoraBackendController:
                 'error': 'Advice service unavailable'
             }
     
-    def get_user_chat_history(self, user_id: str) -> dict:
+    async def get_user_chat_history(self, user_id: str) -> dict:
         """Get chat history for user"""
         try:
-            ai_response = self.ai_client.get_chat_history(user_id)
+            ai_response = await self.ai_client.get_chat_history(user_id)
             
             if ai_response['success']:
                 return {
                     'success': True,
                     'history': ai_response['data']['data'],
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': _cached_timestamp()
                 }
             else:
                 return {
@@ -364,24 +736,36 @@ class FarmoraBackendController:
                 'error': 'Chat history service unavailable'
             }
     
-    def get_dashboard_data(self, user_id: str) -> dict:
+    async def get_dashboard_data(self, user_id: str) -> dict:
         """Get AI-powered dashboard data for user"""
         try:
-            # Get seasonal advice
-            seasonal_response = self.ai_client.get_seasonal_advice()
-            
-            # Get recent chat history
-            history_response = self.ai_client.get_chat_history(user_id)
+            # Seasonal advice, recent chat history and service health are independent,
+            # so fetch them concurrently
+            responses = await asyncio.gather(
+                self.ai_client.get_seasonal_advice(),
+                self.ai_client.get_chat_history(user_id, limit=5),
+                self.ai_client.check_service_health(),
+                return_exceptions=True
+            )
+            # A failed call degrades its own section instead of the whole dashboard
+            seasonal_response, history_response, health_response = (
+                {'success': False, 'error': str(response)} if isinstance(response, Exception) else response
+                for response in responses
+            )
             
-            # Check service health
-            health_response = self.ai_client.check_service_health()
+            # Index straight into successful responses; defaults are only built for failed sections
+            if history_response['success']:
+                history: ChatHistory = history_response['data']['data']
+                recent_chats = history.get('conversation_history', [])
+            else:
+                recent_chats = []
             
             return {
                 'success': True,
-                'seasonal_advice': seasonal_response.get('data', {}).get('seasonal_advice', {}),
-                'recent_chats': history_response.get('data', {}).get('data', {}).get('conversation_history', [])[-5:],
+                'seasonal_advice': seasonal_response['data']['seasonal_advice'] if seasonal_response['success'] else {},
+                'recent_chats': recent_chats,
                 'ai_service_status': 'online' if health_response['success'] else 'offline',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _cached_timestamp()
             }
             
         except Exception as e:
@@ -395,9 +779,20 @@ class FarmoraBackendController:
 
 # === Flask Example ===
 def create_flask_routes(app, controller):
-    """Example Flask routes using the controller"""
+    """Example Flask routes using the controller
+    
+    Image uploads are downscaled in 'spawn' worker processes, which re-import the
+    entry script: start the app under `if __name__ == '__main__':` (or from a WSGI
+    server, which imports it as a module) so the workers do not start it again.
+    """
     from flask import request, jsonify, session
     
+    def json_response(result):
+        """Serialize a handler result with orjson, falling back to jsonify"""
+        if orjson is None:
+            return jsonify(result)
+        return app.response_class(orjson.dumps(result), mimetype='application/json')
+    
     @app.route('/api/ai-advisory/chat', methods=['POST'])
     def ai_chat():
         user_id = session.get('user_id', 'anonymous')
@@ -410,8 +805,8 @@ def create_flask_routes(app, controller):
             'platform': request.json.get('platform', 'web') if request.is_json else 'web'
         }
         
-        result = controller.handle_chat_request(user_id, request_data)
-        return jsonify(result)
+        result = controller.run_sync(controller.handle_chat_request(user_id, request_data))
+        return json_response(result)
     
     @app.route('/api/ai-advisory/analyze-image', methods=['POST'])
     def analyze_image():
@@ -419,20 +814,29 @@ def create_flask_routes(app, controller):
             'image': request.files.get('image') if request.files else request.json.get('image') if request.is_json else None
         }
         
-        result = controller.handle_image_analysis_request(request_data)
-        return jsonify(result)
+        result = controller.run_sync(controller.handle_image_analysis_request(request_data))
+        return json_response(result)
+    
+    @app.route('/api/ai-advisory/analyze-images', methods=['POST'])
+    def analyze_images():
+        request_data = {
+            'images': request.files.getlist('images')
+        }
+        
+        result = controller.run_sync(controller.handle_batch_image_analysis_request(request_data))
+        return json_response(result)
     
     @app.route('/api/ai-advisory/search', methods=['POST'])
     def knowledge_search():
         request_data = request.get_json()
-        result = controller.handle_knowledge_search_request(request_data)
-        return jsonify(result)
+        result = controller.run_sync(controller.handle_knowledge_search_request(request_data))
+        return json_response(result)
     
     @app.route('/api/ai-advisory/chat-history', methods=['GET'])
     def chat_history():
         user_id = session.get('user_id', 'anonymous')
-        result = controller.get_user_chat_history(user_id)
-        return jsonify(result)
+        result = controller.run_sync(controller.get_user_chat_history(user_id))
+        return json_response(result)
 
 # === FastAPI Example ===
 def create_fastapi_routes():
@@ -440,8 +844,22 @@ def create_fastapi_routes():
     from fastapi import FastAPI, UploadFile, File, Depends
     from pydantic import BaseModel
     
-    app = FastAPI()
-    controller = FarmoraBackendController()
+    if orjson is not None:
+        from fastapi.responses import ORJSONResponse
+        app = FastAPI(default_response_class=ORJSONResponse)
+    else:
+        app = FastAPI()
+    # One AI client for the whole app: every request shares its pooled keep-alive connections
+    app.state.ai_client = FarmoraAIAdvisoryClient(pool_size=100)
+    controller = FarmoraBackendController(app.state.ai_client)
+    
+    @app.on_event("startup")
+    async def open_ai_client():
+        await app.state.ai_client.open()
+    
+    @app.on_event("shutdown")
+    async def close_ai_client():
+        await controller.close()
     
     class ChatRequest(BaseModel):
         message: str = None
@@ -460,24 +878,32 @@ def create_fastapi_routes():
             'platform': request.platform
         }
         
-        return controller.handle_chat_request(user_id, request_data)
+        return await controller.handle_chat_request(user_id, request_data)
+    
+    @app.post("/api/ai-advisory/analyze-image")
+    async def analyze_image(image: UploadFile = File(...)):
+        request_data = {
+            'image': await image.read()
+        }
+        
+        return await controller.handle_image_analysis_request(request_data)
     
     return app
 
-if __name__ == "__main__":
-    # Example usage
+async def main():
+    """Example usage"""
     controller = FarmoraBackendController()
     
     # Test the integration
     print("🧪 Testing Farmora Backend Integration...")
     
     # Check AI service health
-    health = controller.ai_client.check_service_health()
+    health = await controller.ai_client.check_service_health()
     print(f"AI Service Health: {'✅ Online' if health['success'] else '❌ Offline'}")
     
     if health['success']:
         # Test chat functionality
-        chat_result = controller.handle_chat_request("test_user", {
+        chat_result = await controller.handle_chat_request("test_user", {
             'message': "Hello, I need help with organic farming practices",
             'context': {'user_type': 'farmer', 'experience': 'intermediate'}
         })
@@ -486,4 +912,9 @@ if __name__ == "__main__":
         if chat_result['success']:
             print(f"AI Response: {chat_result['message'][:100]}...")
     
-    print("\n🌾 Integration ready! Adapt the controller to your backend framework.")
\ No newline at end of file
+    await controller.close()
+    print("\n🌾 Integration ready! Adapt the controller to your backend framework.")
+
+if __name__ == "__main__":
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        runner.run(main())
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the Farmora AI Advisory API
+Usage: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+
+bind = f"{os.environ.get('AI_SERVICE_HOST', '0.0.0.0')}:{os.environ.get('AI_SERVICE_PORT', '5002')}"
+
+# Threaded workers: requests within a worker share one model and one batcher,
+# so concurrent uploads are coalesced into a single predict call
+worker_class = 'gthread'
+workers = int(os.environ.get('AI_SERVICE_WORKERS', os.cpu_count() or 2))
+threads = int(os.environ.get('AI_SERVICE_THREADS', 16))
+timeout = 60
+
+# Import the app once in the master so the knowledge base is shared copy-on-write
+# across workers. TensorFlow is not fork-safe, so the model is loaded in each
+# worker after the fork instead
+preload_app = True
+
+def post_fork(server, worker):
+    """Load the ML model and start background threads inside each worker"""
+    from wsgi import init_worker
+    init_worker()
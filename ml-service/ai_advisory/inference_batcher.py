@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Dynamic inference batching for the AI Advisory API
+Coalesces concurrent single-image requests into one batched model call
+
+Requests arrive already preprocessed on the API's decode pool, so decoding of
+the next images overlaps with inference on the current batch. The bounded
+queue between the two stages applies backpressure when inference falls behind.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class _PendingRequest:
+    """A single queued inference request and the slot its result lands in"""
+
+    __slots__ = ('inputs', 'done', 'result', 'error')
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class InferenceBatcher:
+    """Background worker that batches concurrent predictions into one call"""
+
+    def __init__(self, predict_fn, max_batch_size: int = 16, batch_wait_timeout_s: float = 0.05,
+                 max_pending: int = 64):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._batch_buffer = None  # (max_batch_size, H, W, C), reused across batches
+        self._worker = threading.Thread(target=self._run, name='inference-batcher', daemon=True)
+        self._worker.start()
+
+    def predict(self, img_array: np.ndarray, timeout: float = 30.0) -> np.ndarray:
+        """Queue a (1, H, W, C) array and block until its (1, num_classes) prediction is ready"""
+        request = _PendingRequest(img_array)
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            raise TimeoutError(f"Inference queue stayed full for {timeout}s")
+
+        if not request.done.wait(max(0.0, deadline - time.monotonic())):
+            raise TimeoutError(f"Inference did not complete within {timeout}s")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self):
+        """Drain up to max_batch_size requests, waiting at most batch_wait_timeout_s for stragglers"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_wait_timeout_s
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._process(batch)
+
+    def _stage(self, batch):
+        """Copy each request's input into a preallocated batch buffer and return the filled rows"""
+        sample_shape = batch[0].inputs.shape[1:]
+        if self._batch_buffer is None or self._batch_buffer.shape[1:] != sample_shape:
+            self._batch_buffer = np.empty((self.max_batch_size,) + sample_shape, dtype=np.float32)
+
+        for i, request in enumerate(batch):
+            np.copyto(self._batch_buffer[i], request.inputs[0])
+        return self._batch_buffer[:len(batch)]
+
+    def _process(self, batch):
+        """Run one model call for the whole batch and hand each request its row"""
+        try:
+            inputs = self._stage(batch)
+            predictions = self.predict_fn(inputs)
+            for i, request in enumerate(batch):
+                request.result = predictions[i:i + 1]
+        except Exception as e:
+            logger.error(f"Batched inference failed for {len(batch)} request(s): {e}")
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.done.set()
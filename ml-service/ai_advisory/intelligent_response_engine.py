@@ -5,15 +5,179 @@ Provides OpenAI-like conversational responses with agricultural expertise
 """
 
 import re
-import json
+import bisect
+import itertools
 import logging
+import functools
+import threading
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
-import numpy as np
-from agricultural_knowledge_base import AgriculturalKnowledgeBase
+from functools import lru_cache
+from dataclasses import dataclass
+from datetime import datetime
+from agricultural_knowledge_base import AgriculturalKnowledgeBase, CONTENT_MATCH_SCORE
+
+try:
+    import ahocorasick  # pyahocorasick: one pass over the query for every entity name
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # matches every intent pattern in a single SIMD pass over the query
+except ImportError:
+    hyperscan = None
 
 logger = logging.getLogger(__name__)
 
+# Entity names recognised in queries, per category, in the order they are reported
+ENTITY_VOCABULARY = {
+    'crops': ('rice', 'wheat', 'tomato', 'cotton', 'corn', 'potato', 'onion', 'garlic', 'sugarcane', 'banana', 'mango'),
+    'pests': ('aphid', 'bollworm', 'caterpillar', 'thrips', 'whitefly', 'mites', 'beetle', 'armyworm'),
+    'diseases': ('blight', 'rust', 'blast', 'wilt', 'rot', 'mold', 'fungus')
+}
+
+# Whole words that raise a query's urgency, with the inflections farmers commonly use
+URGENT_KEYWORDS = frozenset({
+    'urgent', 'urgently', 'emergency', 'emergencies', 'dying', 'critical', 'critically', 'immediately', 'help', 'crisis',
+    'destroy', 'destroyed', 'destroying', 'destroys'
+})
+MEDIUM_KEYWORDS = frozenset({
+    'problem', 'problems', 'issue', 'issues', 'concern', 'concerns', 'damage', 'damaged', 'damages',
+    'damaging', 'loss', 'losses', 'affected'
+})
+_WORD_RE = re.compile(r'[a-z]+')
+# The same whole-word test over a longer text, for batches of queries
+_URGENT_RE = re.compile(r'(?<![a-z])(?:%s)(?![a-z])' % '|'.join(sorted(URGENT_KEYWORDS)))
+_MEDIUM_RE = re.compile(r'(?<![a-z])(?:%s)(?![a-z])' % '|'.join(sorted(MEDIUM_KEYWORDS)))
+
+# Repeat queries (greetings, "how to grow rice") reuse their analysis and generated response
+ANALYSIS_CACHE_SIZE = 256
+RESPONSE_CACHE_SIZE = 256
+
+# Flattened knowledge base records, per pest name looked up
+RECORD_CACHE_SIZE = 256
+
+# Intents whose response depends only on the detected crops, pests and diseases; any other
+# intent is answered from the knowledge base entry that best matches the query
+_ENTITY_INTENTS = frozenset({
+    'pest_identification', 'disease_identification', 'crop_cultivation', 'fertilizer_advice',
+    'irrigation_advice', 'weather_related', 'market_prices', 'soil_management'
+})
+
+# Suggestions and follow-up questions appended to every response, per intent
+INTENT_SUGGESTIONS = {
+    'pest_identification': (
+        "Take clear photos of affected plants for better diagnosis",
+        "Monitor pest population levels regularly",
+        "Consider biological control methods first",
+        "Apply treatments during early morning or evening"
+    ),
+    'crop_cultivation': (
+        "Plan crop rotation for next season",
+        "Test soil before planting",
+        "Select climate-appropriate varieties",
+        "Prepare irrigation schedule"
+    ),
+    'weather_related': (
+        "Set up weather monitoring alerts",
+        "Prepare contingency plans for extreme weather",
+        "Adjust planting dates based on weather patterns",
+        "Install protective structures if needed"
+    )
+}
+DEFAULT_SUGGESTIONS = (
+    "Keep detailed farm records",
+    "Consult local agricultural experts",
+    "Stay updated with latest farming techniques",
+    "Join farmer groups for knowledge sharing"
+)
+
+INTENT_FOLLOW_UP_QUESTIONS = {
+    'pest_identification': (
+        "What crop is affected by this pest?",
+        "How long have you noticed this problem?",
+        "What is the extent of damage (percentage of crop affected)?",
+        "Have you tried any treatments so far?"
+    ),
+    'crop_cultivation': (
+        "What is your farm size and location?",
+        "What soil type do you have?",
+        "Do you have irrigation facilities?",
+        "What's your target market for this crop?"
+    ),
+    'fertilizer_advice': (
+        "Have you conducted a soil test recently?",
+        "What crop are you planning to fertilize?",
+        "What's your budget for fertilizers?",
+        "Do you prefer organic or chemical fertilizers?"
+    )
+}
+DEFAULT_FOLLOW_UP_QUESTIONS = (
+    "What specific aspect would you like to know more about?",
+    "Do you need help with any other farming topics?",
+    "Would you like location-specific advice?",
+    "Are there any other crops you're planning to grow?"
+)
+
+# Fixed answers of the pest and disease responses
+_GENERAL_PEST_MESSAGE = (
+    "🐛 **General Pest Management Advice:**\n"
+    "Without specific pest identification, here are general IPM practices:"
+)
+_GENERAL_PEST_RECOMMENDATIONS = (
+    "🔍 **Monitor regularly** - Check plants weekly for early signs",
+    "🌱 **Use resistant varieties** - Plant pest-resistant crop varieties",
+    "🏡 **Maintain field hygiene** - Remove crop residues and weeds",
+    "🐞 **Encourage beneficial insects** - Preserve natural predators",
+    "💧 **Proper irrigation** - Avoid water stress which attracts pests",
+    "🔄 **Crop rotation** - Break pest life cycles with different crops"
+)
+_GENERAL_DISEASE_MESSAGE = "🦠 **General Disease Management:**\nFor effective disease prevention and control:"
+_GENERAL_DISEASE_RECOMMENDATIONS = (
+    "🌱 Use certified, disease-free seeds",
+    "🔄 Practice crop rotation to break disease cycles",
+    "💧 Ensure proper drainage to avoid waterlogging",
+    "🌬️ Maintain good air circulation between plants",
+    "🧹 Remove and destroy infected plant material",
+    "⏰ Apply preventive fungicides during favorable conditions"
+)
+
+def _bullets(items) -> str:
+    """One newline-terminated '• item' line per item"""
+    return ''.join([f"• {item}\n" for item in items])
+
+def _numbered(items) -> str:
+    """One newline-terminated '1. item' line per item, numbered from 1"""
+    return ''.join([f"{i}. {item}\n" for i, item in enumerate(items, 1)])
+
+@dataclass(frozen=True, slots=True)
+class PestRecord:
+    """A pest's knowledge base entry, flattened to the fields and list lengths its responses show"""
+    scientific_name: str
+    identification: Optional[Tuple[str, str, str]]  # size, color, location
+    symptoms: Tuple[str, ...]
+    has_management: bool
+    organic: Tuple[str, ...]
+    biological: Tuple[str, ...]
+    chemical: Tuple[str, ...]
+    prevention_tips: Tuple[str, ...]
+
+def _record_match(expression_id, start, end, flags, matched):
+    """Hyperscan match handler: collect the id of each matching intent expression"""
+    matched.append(expression_id)
+
+def _record_batch_match(expression_id, start, end, flags, matched):
+    """Hyperscan match handler: collect the end offset and id of every intent expression match"""
+    matched.append((end, expression_id))
+
+def _build_entity_automaton():
+    """Aho-Corasick automaton over ENTITY_VOCABULARY; each word maps to (category, rank, word)"""
+    automaton = ahocorasick.Automaton()
+    for category, words in ENTITY_VOCABULARY.items():
+        for rank, word in enumerate(words):
+            automaton.add_word(word, (category, rank, word))
+    automaton.make_automaton()
+    return automaton
+
 class IntelligentResponseEngine:
     """Advanced AI response engine for agricultural advisory chat system"""
     
@@ -22,6 +186,32 @@ class IntelligentResponseEngine:
         self.conversation_context = {}
         self.response_templates = self._load_response_templates()
         self.intent_patterns = self._load_intent_patterns()
+        # Queries arrive lowercased, so the patterns are lowercase and need no IGNORECASE
+        self._greeting_re = re.compile(r'hello|hi|hey|good morning|good evening|greetings')
+        self._time_re = re.compile(r'today|tomorrow|week|month|season|spring|summer|winter|monsoon')
+        self._entity_automaton = _build_entity_automaton() if ahocorasick is not None else None
+        self._intent_names = list(self.intent_patterns) + ['greeting']
+        self._intent_database = self._compile_intent_database() if hyperscan is not None else None
+        # Batches need every match's offset to tell the queries apart, not just one match per intent
+        self._batch_intent_database = self._compile_intent_database(flags=0) if hyperscan is not None else None
+        self._scan_scratch = threading.local()
+        self._analyze_cached = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze)
+        self._respond_cached = lru_cache(maxsize=RESPONSE_CACHE_SIZE)(self._respond)
+        self._knowledge_topic_cached = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._knowledge_topic)
+        self._pest_record = lru_cache(maxsize=RECORD_CACHE_SIZE)(self._build_pest_record)
+        # Response generators per intent; any other intent gets the general response
+        self._image_handlers = {
+            'pest_identification': self._generate_pest_response,
+            'disease_identification': self._generate_disease_response
+        }
+        self._text_handlers = {
+            'crop_cultivation': self._generate_crop_response,
+            'fertilizer_advice': self._generate_fertilizer_response,
+            'irrigation_advice': self._generate_irrigation_response,
+            'weather_related': self._generate_weather_response,
+            'market_prices': self._generate_market_response,
+            'soil_management': self._generate_soil_response
+        }
         self.conversation_memory = {}
     
     def _load_response_templates(self):
@@ -65,8 +255,8 @@ class IntelligentResponseEngine:
         }
     
     def _load_intent_patterns(self):
-        """Load patterns to identify user intent"""
-        return {
+        """Load patterns to identify user intent, compiled into one alternation per intent"""
+        patterns = {
             'pest_identification': [
                 r'pest.*problem|bug.*eating|insect.*damage|holes.*leaves|yellow.*leaves|curled.*leaves',
                 r'what.*pest|identify.*pest|pest.*name|bug.*identification',
@@ -108,9 +298,76 @@ class IntelligentResponseEngine:
                 r'soil.*preparation|land.*preparation|soil.*amendment'
             ]
         }
+        return {intent: re.compile('|'.join(intent_patterns)) for intent, intent_patterns in patterns.items()}
     
     def analyze_query(self, query: str, user_context: Dict = None) -> Dict:
         """Analyze user query to understand intent and extract key information"""
+        query_lower, intent, entities, urgency = self._analyze_cached(query)
+        
+        # Get context from previous conversations
+        context = user_context or {}
+        
+        return {
+            'intent': intent,
+            # The cached entity lists are shared, so each analysis gets its own copies
+            'entities': {category: list(values) for category, values in entities.items()},
+            'urgency': urgency,
+            'context': context,
+            'original_query': query,
+            'processed_query': query_lower
+        }
+    
+    def analyze_queries(self, queries: List[str], user_context: Dict = None) -> List[Dict]:
+        """Analyze a batch of queries (e.g. a replayed conversation history) in one scan of their joined text"""
+        distinct = list(dict.fromkeys(queries))
+        lowered = [query.lower() for query in distinct]
+        # Join on newlines: no pattern, entity name or word contains one and '.' does not match one,
+        # so every match falls inside a single query and its start offset tells which
+        joined = '\n'.join(lowered)
+        starts = list(itertools.accumulate((len(query) + 1 for query in lowered[:-1]), initial=0))
+        owner = functools.partial(bisect.bisect_right, starts)  # 1 + index of the query holding an offset
+        
+        intents = self._detect_intents(lowered, joined, owner)
+        
+        entities = [{'crops': [], 'pests': [], 'diseases': [], 'locations': [], 'time_references': [], 'quantities': []}
+                    for _ in distinct]
+        if self._entity_automaton is not None:
+            found = [set() for _ in distinct]
+            for end, match in self._entity_automaton.iter(joined):
+                found[owner(end) - 1].add(match)
+            for query_entities, matches in zip(entities, found):
+                for category, _, word in sorted(matches):
+                    query_entities[category].append(word)
+        else:
+            for query_lower, query_entities in zip(lowered, entities):
+                for category, words in ENTITY_VOCABULARY.items():
+                    query_entities[category] = [word for word in words if word in query_lower]
+        for match in self._time_re.finditer(joined):
+            entities[owner(match.start()) - 1]['time_references'].append(match.group())
+        
+        urgencies = ['low'] * len(distinct)
+        for level, keyword_re in (('medium', _MEDIUM_RE), ('high', _URGENT_RE)):
+            for match in keyword_re.finditer(joined):
+                urgencies[owner(match.start()) - 1] = level
+        
+        analyses = dict(zip(distinct, zip(lowered, intents, entities, urgencies)))
+        context = user_context or {}
+        results = []
+        for query in queries:
+            query_lower, intent, query_entities, urgency = analyses[query]
+            results.append({
+                'intent': intent,
+                'entities': {category: list(values) for category, values in query_entities.items()},
+                'urgency': urgency,
+                'context': context,
+                'original_query': query,
+                'processed_query': query_lower
+            })
+        return results
+    
+    def _analyze(self, query: str) -> Tuple[str, str, Dict, str]:
+        """Lowercased query, intent, entities and urgency of a query (cached per engine by _analyze_cached)"""
+        # Lowercase once; every pattern and vocabulary below is lowercase
         query_lower = query.lower()
         
         # Detect intent
@@ -122,43 +379,58 @@ class IntelligentResponseEngine:
         # Analyze sentiment and urgency
         urgency = self._assess_urgency(query_lower)
         
-        # Get context from previous conversations
-        context = user_context or {}
+        return query_lower, intent, entities, urgency
+    
+    def clear_caches(self):
+        """Drop cached analyses and responses, e.g. after the knowledge base changes"""
+        self._analyze_cached.cache_clear()
+        self._respond_cached.cache_clear()
+        self._knowledge_topic_cached.cache_clear()
+    
+    def generate_response(self, analysis: Dict, image_analysis: Dict = None) -> Dict:
+        """Generate intelligent response based on query analysis"""
+        # Responses to image analyses depend on the prediction, so only text queries are cached
+        if image_analysis is not None:
+            return self._build_response(analysis, image_analysis)
         
-        return {
+        intent = analysis['intent']
+        entities = analysis['entities']
+        # Paraphrases that lead to the same knowledge base entry share one response
+        response = self._respond_cached(
+            intent, analysis['urgency'],
+            tuple(entities['crops']), tuple(entities['pests']), tuple(entities['diseases']),
+            None if intent in _ENTITY_INTENTS else self._knowledge_topic_cached(analysis['processed_query']),
+            # Weather advice follows the current season
+            datetime.now().month if intent == 'weather_related' else None
+        )
+        # Callers add keys to the response, so each gets its own copy of the dict and its lists
+        return {key: list(value) if isinstance(value, list) else value for key, value in response.items()}
+    
+    def _respond(self, intent: str, urgency: str, crops: Tuple[str, ...], pests: Tuple[str, ...],
+                 diseases: Tuple[str, ...], topic: Optional[Tuple[str, str]], month: Optional[int]) -> Dict:
+        """Response to a text query, keyed on everything it depends on (cached by _respond_cached)"""
+        analysis = {
             'intent': intent,
-            'entities': entities,
+            'entities': {'crops': list(crops), 'pests': list(pests), 'diseases': list(diseases)},
             'urgency': urgency,
-            'context': context,
-            'original_query': query,
-            'processed_query': query_lower
+            'knowledge_topic': topic
         }
+        return self._build_response(analysis)
     
-    def generate_response(self, analysis: Dict, image_analysis: Dict = None) -> Dict:
-        """Generate intelligent response based on query analysis"""
+    def _build_response(self, analysis: Dict, image_analysis: Dict = None) -> Dict:
+        """Generate the response for an analysis, dispatching on its intent"""
         intent = analysis['intent']
         entities = analysis['entities']
         urgency = analysis['urgency']
         
         try:
-            if intent == 'pest_identification':
-                response = self._generate_pest_response(entities, image_analysis)
-            elif intent == 'disease_identification':
-                response = self._generate_disease_response(entities, image_analysis)
-            elif intent == 'crop_cultivation':
-                response = self._generate_crop_response(entities)
-            elif intent == 'fertilizer_advice':
-                response = self._generate_fertilizer_response(entities)
-            elif intent == 'irrigation_advice':
-                response = self._generate_irrigation_response(entities)
-            elif intent == 'weather_related':
-                response = self._generate_weather_response(entities)
-            elif intent == 'market_prices':
-                response = self._generate_market_response(entities)
-            elif intent == 'soil_management':
-                response = self._generate_soil_response(entities)
+            image_handler = self._image_handlers.get(intent)
+            if image_handler is not None:
+                response = image_handler(entities, image_analysis)
             else:
-                response = self._generate_general_response(analysis)
+                text_handler = self._text_handlers.get(intent)
+                response = text_handler(entities) if text_handler is not None else \
+                    self._generate_general_response(analysis)
             
             # Add urgency indicators
             if urgency == 'high':
@@ -181,18 +453,68 @@ class IntelligentResponseEngine:
             logger.error(f"Error generating response: {e}")
             return self._generate_fallback_response(analysis)
     
+    def _compile_intent_database(self, flags: int = None):
+        """Hyperscan database with one expression per intent (greeting last); an expression's id is its priority"""
+        # Every pattern is literals joined by '.*' and '|', which match the same bytes of the UTF-8 query as
+        # the str patterns match characters
+        expressions = [pattern.pattern.encode() for pattern in self.intent_patterns.values()]
+        expressions.append(self._greeting_re.pattern.encode())
+        database = hyperscan.Database()
+        database.compile(expressions=expressions, ids=list(range(len(expressions))), elements=len(expressions),
+                         flags=[hyperscan.HS_FLAG_SINGLEMATCH if flags is None else flags] * len(expressions))
+        return database
+    
+    def _detect_intents(self, lowered: List[str], joined: str, owner) -> List[str]:
+        """Detect the intent of each of a batch of lowercased queries, joined on newlines"""
+        if self._batch_intent_database is not None:
+            scratch = getattr(self._scan_scratch, 'batch_scratch', None)
+            if scratch is None:
+                scratch = self._scan_scratch.batch_scratch = hyperscan.Scratch(self._batch_intent_database)
+            encoded = [query.encode() for query in lowered]
+            starts = list(itertools.accumulate((len(query) + 1 for query in encoded[:-1]), initial=0))
+            matched = []
+            self._batch_intent_database.scan(b'\n'.join(encoded), match_event_handler=_record_batch_match,
+                                             context=matched, scratch=scratch)
+            # Each query takes its highest-priority match; a match ends one byte past the query it is in
+            priorities = [len(self._intent_names)] * len(lowered)
+            for end, expression_id in matched:
+                index = bisect.bisect_right(starts, end - 1) - 1
+                priorities[index] = min(priorities[index], expression_id)
+            return [self._intent_names[priority] if priority < len(self._intent_names) else 'general_inquiry'
+                    for priority in priorities]
+        
+        # Intents are checked in priority order, so a query keeps the first one found in it
+        intents = ['general_inquiry'] * len(lowered)
+        unresolved = set(range(len(lowered)))
+        for intent, pattern in itertools.chain(self.intent_patterns.items(), [('greeting', self._greeting_re)]):
+            for match in pattern.finditer(joined):
+                index = owner(match.start()) - 1
+                if index in unresolved:
+                    intents[index] = intent
+                    unresolved.discard(index)
+        return intents
+    
     def _detect_intent(self, query: str) -> str:
         """Detect user intent from query"""
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query, re.IGNORECASE):
-                    return intent
+        if self._intent_database is not None:
+            # Scratch space cannot be shared between concurrent scans, so each thread has its own
+            scratch = getattr(self._scan_scratch, 'scratch', None)
+            if scratch is None:
+                scratch = self._scan_scratch.scratch = hyperscan.Scratch(self._intent_database)
+            matched = []
+            self._intent_database.scan(query.encode(), match_event_handler=_record_match,
+                                       context=matched, scratch=scratch)
+            # The highest-priority intent with a match anywhere wins
+            return self._intent_names[min(matched)] if matched else 'general_inquiry'
+        
+        # Intents are checked in priority order, so the first one matching anywhere in the query wins
+        for intent, pattern in self.intent_patterns.items():
+            if pattern.search(query):
+                return intent
         
         # Check for greeting patterns
-        greeting_patterns = [r'hello|hi|hey|good morning|good evening|greetings']
-        for pattern in greeting_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return 'greeting'
+        if self._greeting_re.search(query):
+            return 'greeting'
         
         return 'general_inquiry'
     
@@ -207,155 +529,120 @@ class IntelligentResponseEngine:
             'quantities': []
         }
         
-        # Extract crop names
-        crop_names = ['rice', 'wheat', 'tomato', 'cotton', 'corn', 'potato', 'onion', 'garlic', 'sugarcane', 'banana', 'mango']
-        for crop in crop_names:
-            if crop in query:
-                entities['crops'].append(crop)
-        
-        # Extract pest names
-        pest_names = ['aphid', 'bollworm', 'caterpillar', 'thrips', 'whitefly', 'mites', 'beetle', 'armyworm']
-        for pest in pest_names:
-            if pest in query:
-                entities['pests'].append(pest)
-        
-        # Extract disease names
-        disease_names = ['blight', 'rust', 'blast', 'wilt', 'rot', 'mold', 'fungus']
-        for disease in disease_names:
-            if disease in query:
-                entities['diseases'].append(disease)
+        # Extract crop, pest and disease names
+        if self._entity_automaton is not None:
+            # Scan once, then report each name once and in vocabulary order, however often it occurs
+            for category, _, word in sorted({match for _, match in self._entity_automaton.iter(query)}):
+                entities[category].append(word)
+        else:
+            for category, words in ENTITY_VOCABULARY.items():
+                entities[category] = [word for word in words if word in query]
         
         # Extract time references
-        time_patterns = [r'today|tomorrow|week|month|season|spring|summer|winter|monsoon']
-        for pattern in time_patterns:
-            matches = re.findall(pattern, query, re.IGNORECASE)
-            entities['time_references'].extend(matches)
+        entities['time_references'].extend(self._time_re.findall(query))
         
         return entities
     
     def _assess_urgency(self, query: str) -> str:
         """Assess urgency level of the query"""
-        urgent_keywords = ['urgent', 'emergency', 'dying', 'critical', 'immediately', 'help', 'crisis', 'destroy']
-        medium_keywords = ['problem', 'issue', 'concern', 'damage', 'loss', 'affected']
-        
-        for keyword in urgent_keywords:
-            if keyword in query:
-                return 'high'
-        
-        for keyword in medium_keywords:
-            if keyword in query:
-                return 'medium'
-        
+        # Match whole words, so e.g. 'helpful' or 'issued' do not count
+        words = set(_WORD_RE.findall(query))
+        if not URGENT_KEYWORDS.isdisjoint(words):
+            return 'high'
+        if not MEDIUM_KEYWORDS.isdisjoint(words):
+            return 'medium'
         return 'low'
     
     def _generate_pest_response(self, entities: Dict, image_analysis: Dict = None) -> Dict:
         """Generate response for pest-related queries"""
-        response_parts = []
+        # The message is the newline-join of whole sections, each ending with its trailing blank line
+        sections = []
         recommendations = []
         
         if image_analysis:
             # Use ML model results
             detected_pest = image_analysis.get('predicted_class', 'unknown')
             confidence = image_analysis.get('confidence', 0.0)
-            
-            response_parts.append(f"🔍 **AI Analysis Results:**")
-            response_parts.append(f"Detected Pest: **{detected_pest.title()}**")
-            response_parts.append(f"Confidence: **{confidence:.1%}**")
-            response_parts.append("")
+            sections.append(f"🔍 **AI Analysis Results:**\nDetected Pest: **{detected_pest.title()}**\n"
+                            f"Confidence: **{confidence:.1%}**\n")
             
             # Get detailed pest information
-            pest_info = self.knowledge_base.get_pest_info(detected_pest)
+            pest = self._pest_record(detected_pest)
             
         elif entities['pests']:
             # Use pest name from text
             detected_pest = entities['pests'][0]
-            pest_info = self.knowledge_base.get_pest_info(detected_pest)
+            pest = self._pest_record(detected_pest)
             
         else:
             # General pest advice
-            response_parts.append("🐛 **General Pest Management Advice:**")
-            response_parts.append("Without specific pest identification, here are general IPM practices:")
-            
-            recommendations = [
-                "🔍 **Monitor regularly** - Check plants weekly for early signs",
-                "🌱 **Use resistant varieties** - Plant pest-resistant crop varieties",
-                "🏡 **Maintain field hygiene** - Remove crop residues and weeds",
-                "🐞 **Encourage beneficial insects** - Preserve natural predators",
-                "💧 **Proper irrigation** - Avoid water stress which attracts pests",
-                "🔄 **Crop rotation** - Break pest life cycles with different crops"
-            ]
-            
             return {
-                'message': '\n'.join(response_parts),
-                'recommendations': recommendations,
+                'message': _GENERAL_PEST_MESSAGE,
+                'recommendations': list(_GENERAL_PEST_RECOMMENDATIONS),
                 'type': 'pest_general',
                 'confidence': 0.8
             }
         
-        if pest_info:
-            response_parts.append(f"📋 **About {detected_pest.title()}:**")
-            response_parts.append(f"Scientific Name: *{pest_info.get('scientific_name', 'N/A')}*")
-            response_parts.append("")
+        if pest is not None:
+            sections.append(f"📋 **About {detected_pest.title()}:**\n"
+                            f"Scientific Name: *{pest.scientific_name}*\n")
             
             # Identification details
-            identification = pest_info.get('identification', {})
-            if identification:
-                response_parts.append("🔬 **Identification Features:**")
-                response_parts.append(f"• Size: {identification.get('size', 'Variable')}")
-                response_parts.append(f"• Color: {identification.get('color', 'Variable')}")
-                response_parts.append(f"• Location: {identification.get('location', 'Various parts')}")
-                response_parts.append("")
+            if pest.identification:
+                size, color, location = pest.identification
+                sections.append(f"🔬 **Identification Features:**\n"
+                                f"• Size: {size}\n• Color: {color}\n• Location: {location}\n")
             
             # Damage symptoms
-            symptoms = pest_info.get('damage_symptoms', [])
-            if symptoms:
-                response_parts.append("⚠️ **Damage Symptoms:**")
-                for symptom in symptoms[:4]:  # Top 4 symptoms
-                    response_parts.append(f"• {symptom}")
-                response_parts.append("")
+            if pest.symptoms:
+                sections.append("⚠️ **Damage Symptoms:**\n" + _bullets(pest.symptoms))
             
             # Management recommendations
-            management = pest_info.get('management', {})
-            if management:
-                response_parts.append("🎯 **Treatment Recommendations:**")
-                
-                # Organic treatments
-                organic = management.get('organic', [])
-                if organic:
-                    response_parts.append("**🌿 Organic Methods:**")
-                    for i, method in enumerate(organic[:3], 1):
-                        response_parts.append(f"{i}. {method}")
-                    response_parts.append("")
-                
-                # Biological treatments
-                biological = management.get('biological', [])
-                if biological:
-                    response_parts.append("**🐞 Biological Control:**")
-                    for i, method in enumerate(biological[:3], 1):
-                        response_parts.append(f"{i}. {method}")
-                    response_parts.append("")
+            if pest.has_management:
+                sections.append("🎯 **Treatment Recommendations:**")
                 
-                # Chemical treatments (if needed)
-                chemical = management.get('chemical', [])
-                if chemical:
-                    response_parts.append("**⚗️ Chemical Control (if necessary):**")
-                    for i, method in enumerate(chemical[:2], 1):
-                        response_parts.append(f"{i}. {method}")
-                    response_parts.append("")
+                # Organic, biological and (if needed) chemical treatments
+                if pest.organic:
+                    sections.append("**🌿 Organic Methods:**\n" + _numbered(pest.organic))
+                if pest.biological:
+                    sections.append("**🐞 Biological Control:**\n" + _numbered(pest.biological))
+                if pest.chemical:
+                    sections.append("**⚗️ Chemical Control (if necessary):**\n" + _numbered(pest.chemical))
             
             # Prevention tips
-            prevention = pest_info.get('prevention', [])
-            if prevention:
-                recommendations.extend([f"🛡️ {tip}" for tip in prevention[:4]])
+            recommendations = list(pest.prevention_tips)
         
         return {
-            'message': '\n'.join(response_parts),
+            'message': '\n'.join(sections),
             'recommendations': recommendations,
             'type': 'pest_identification',
-            'detected_pest': detected_pest if 'detected_pest' in locals() else None,
-            'confidence': confidence if 'confidence' in locals() else 0.9
+            'detected_pest': detected_pest,
+            'confidence': confidence if image_analysis else 0.9
         }
     
+    def _build_pest_record(self, pest_name: str) -> Optional['PestRecord']:
+        """The fields of a pest's knowledge base entry that responses use (cached by _pest_record)"""
+        pest_info = self.knowledge_base.get_pest_info(pest_name)
+        if not pest_info:
+            return None
+        
+        identification = pest_info.get('identification', {})
+        management = pest_info.get('management', {})
+        return PestRecord(
+            scientific_name=pest_info.get('scientific_name', 'N/A'),
+            identification=(
+                identification.get('size', 'Variable'),
+                identification.get('color', 'Variable'),
+                identification.get('location', 'Various parts')
+            ) if identification else None,
+            symptoms=tuple(pest_info.get('damage_symptoms', [])[:4]),  # Top 4 symptoms
+            has_management=bool(management),
+            organic=tuple(management.get('organic', [])[:3]) if management else (),
+            biological=tuple(management.get('biological', [])[:3]) if management else (),
+            chemical=tuple(management.get('chemical', [])[:2]) if management else (),
+            prevention_tips=tuple(f"🛡️ {tip}" for tip in pest_info.get('prevention', [])[:4])
+        )
+    
     def _generate_crop_response(self, entities: Dict) -> Dict:
         """Generate response for crop cultivation queries"""
         response_parts = []
@@ -474,67 +761,50 @@ class IntelligentResponseEngine:
     
     def _generate_disease_response(self, entities: Dict, image_analysis: Dict = None) -> Dict:
         """Generate response for disease-related queries"""
-        response_parts = []
+        sections = []
         recommendations = []
         
         if image_analysis:
             # Use ML model results for disease detection
             detected_issue = image_analysis.get('predicted_class', 'unknown')
             confidence = image_analysis.get('confidence', 0.0)
-            
-            response_parts.append(f"🔬 **AI Disease Analysis:**")
-            response_parts.append(f"Detected Issue: **{detected_issue.title()}**")
-            response_parts.append(f"Confidence: **{confidence:.1%}**")
-            response_parts.append("")
+            sections.append(f"🔬 **AI Disease Analysis:**\nDetected Issue: **{detected_issue.title()}**\n"
+                            f"Confidence: **{confidence:.1%}**\n")
         
         if entities['diseases']:
             disease_name = entities['diseases'][0]
             disease_info = self.knowledge_base.get_disease_info(disease_name)
             
             if disease_info:
-                response_parts.append(f"🦠 **About {disease_name.title()}:**")
-                response_parts.append(f"Pathogen: *{disease_info.get('pathogen', 'N/A')}*")
-                response_parts.append("")
+                sections.append(f"🦠 **About {disease_name.title()}:**\n"
+                                f"Pathogen: *{disease_info.get('pathogen', 'N/A')}*\n")
                 
                 symptoms = disease_info.get('symptoms', [])
                 if symptoms:
-                    response_parts.append("⚠️ **Disease Symptoms:**")
-                    for symptom in symptoms[:4]:
-                        response_parts.append(f"• {symptom}")
-                    response_parts.append("")
+                    sections.append("⚠️ **Disease Symptoms:**\n" + _bullets(symptoms[:4]))
                 
                 management = disease_info.get('management', {})
                 if management:
-                    response_parts.append("💊 **Disease Management:**")
+                    sections.append("💊 **Disease Management:**")
                     
                     resistant_vars = management.get('resistant_varieties', [])
                     if resistant_vars:
-                        response_parts.append(f"**🌱 Resistant Varieties:** {', '.join(resistant_vars)}")
+                        sections.append(f"**🌱 Resistant Varieties:** {', '.join(resistant_vars)}")
                     
                     fungicides = management.get('fungicides', [])
                     if fungicides:
-                        response_parts.append(f"**🧪 Fungicides:** {', '.join(fungicides[:3])}")
+                        sections.append(f"**🧪 Fungicides:** {', '.join(fungicides[:3])}")
                     
                     cultural = management.get('cultural_practices', [])
                     if cultural:
-                        response_parts.append("**🏡 Cultural Practices:**")
-                        for practice in cultural[:3]:
-                            response_parts.append(f"• {practice}")
+                        # Last section, so no trailing blank line
+                        sections.append("**🏡 Cultural Practices:**\n" + _bullets(cultural[:3])[:-1])
         else:
-            response_parts.append("🦠 **General Disease Management:**")
-            response_parts.append("For effective disease prevention and control:")
-            
-            recommendations = [
-                "🌱 Use certified, disease-free seeds",
-                "🔄 Practice crop rotation to break disease cycles",
-                "💧 Ensure proper drainage to avoid waterlogging",
-                "🌬️ Maintain good air circulation between plants",
-                "🧹 Remove and destroy infected plant material",
-                "⏰ Apply preventive fungicides during favorable conditions"
-            ]
+            sections.append(_GENERAL_DISEASE_MESSAGE)
+            recommendations = list(_GENERAL_DISEASE_RECOMMENDATIONS)
         
         return {
-            'message': '\n'.join(response_parts),
+            'message': '\n'.join(sections),
             'recommendations': recommendations,
             'type': 'disease_identification',
             'confidence': 0.85
@@ -699,19 +969,17 @@ class IntelligentResponseEngine:
     
     def _generate_general_response(self, analysis: Dict) -> Dict:
         """Generate general farming advice"""
-        query = analysis['original_query']
-        
-        # Search knowledge base
-        search_results = self.knowledge_base.search_knowledge(query)
+        if 'knowledge_topic' in analysis:
+            topic = analysis['knowledge_topic']
+        else:
+            topic = self._knowledge_topic(analysis['original_query'])
         
         response_parts = []
         recommendations = []
         
-        if search_results:
-            top_result = search_results[0]
-            category = top_result['category']
-            key = top_result['key']
-            data = top_result['data']
+        if topic:
+            category, key = topic
+            data = self.knowledge_base.knowledge_base[category][key]
             
             response_parts.append(f"🧠 **Agricultural Knowledge - {category.title()}:**")
             response_parts.append("")
@@ -759,65 +1027,24 @@ class IntelligentResponseEngine:
             'confidence': 0.7
         }
     
+    def _knowledge_topic(self, query: str) -> Optional[Tuple[str, str]]:
+        """(category, key) of the knowledge base entry that best matches the query, if any"""
+        search_results = self.knowledge_base.search_knowledge(query)
+        # Searches score any word of the query, so an entry that matches only one of several words is
+        # likely unrelated; answer from the knowledge base only when the best one scores at least a
+        # content match per searched word
+        min_score = CONTENT_MATCH_SCORE * len(self.knowledge_base.search_terms(query))
+        if not search_results or search_results[0]['relevance_score'] < min_score:
+            return None
+        return search_results[0]['category'], search_results[0]['key']
+    
     def _generate_suggestions(self, intent: str, entities: Dict) -> List[str]:
         """Generate helpful suggestions based on intent"""
-        suggestions = {
-            'pest_identification': [
-                "Take clear photos of affected plants for better diagnosis",
-                "Monitor pest population levels regularly",
-                "Consider biological control methods first",
-                "Apply treatments during early morning or evening"
-            ],
-            'crop_cultivation': [
-                "Plan crop rotation for next season",
-                "Test soil before planting",
-                "Select climate-appropriate varieties",
-                "Prepare irrigation schedule"
-            ],
-            'weather_related': [
-                "Set up weather monitoring alerts",
-                "Prepare contingency plans for extreme weather",
-                "Adjust planting dates based on weather patterns",
-                "Install protective structures if needed"
-            ]
-        }
-        
-        return suggestions.get(intent, [
-            "Keep detailed farm records",
-            "Consult local agricultural experts",
-            "Stay updated with latest farming techniques",
-            "Join farmer groups for knowledge sharing"
-        ])
+        return list(INTENT_SUGGESTIONS.get(intent, DEFAULT_SUGGESTIONS))
     
     def _generate_follow_up_questions(self, intent: str, entities: Dict) -> List[str]:
         """Generate relevant follow-up questions"""
-        questions = {
-            'pest_identification': [
-                "What crop is affected by this pest?",
-                "How long have you noticed this problem?",
-                "What is the extent of damage (percentage of crop affected)?",
-                "Have you tried any treatments so far?"
-            ],
-            'crop_cultivation': [
-                "What is your farm size and location?",
-                "What soil type do you have?",
-                "Do you have irrigation facilities?",
-                "What's your target market for this crop?"
-            ],
-            'fertilizer_advice': [
-                "Have you conducted a soil test recently?",
-                "What crop are you planning to fertilize?",
-                "What's your budget for fertilizers?",
-                "Do you prefer organic or chemical fertilizers?"
-            ]
-        }
-        
-        return questions.get(intent, [
-            "What specific aspect would you like to know more about?",
-            "Do you need help with any other farming topics?",
-            "Would you like location-specific advice?",
-            "Are there any other crops you're planning to grow?"
-        ])
+        return list(INTENT_FOLLOW_UP_QUESTIONS.get(intent, DEFAULT_FOLLOW_UP_QUESTIONS))
     
     def _generate_fallback_response(self, analysis: Dict) -> Dict:
         """Generate fallback response when specific analysis fails"""
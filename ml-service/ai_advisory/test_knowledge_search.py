@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Regression tests for knowledge base search and the general answers built from it
+Run with: python -m unittest test_knowledge_search
+"""
+
+import unittest
+
+from agricultural_knowledge_base import AgriculturalKnowledgeBase
+from intelligent_response_engine import IntelligentResponseEngine
+
+# Queries whose only overlap with the knowledge base is a common word or one word of several
+UNRELATED_QUERIES = [
+    'mites on beans',
+    'Şeker pancarı için gübre',
+    'when to sell garlic',
+    'how do I store grain',
+    'my cow is sick',
+]
+
+class KnowledgeSearchTest(unittest.TestCase):
+    """Search must not match entries on stopwords, and general answers need a relevant entry"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.knowledge_base = AgriculturalKnowledgeBase()
+        cls.engine = IntelligentResponseEngine()
+    
+    def test_stopwords_are_not_searched(self):
+        self.assertEqual(self.knowledge_base.search_terms('Şeker pancarı için gübre'), ['eker', 'pancar', 'bre'])
+        self.assertEqual(self.knowledge_base.search_knowledge('how to do it in the'), [])
+    
+    def test_unrelated_queries_get_general_guidance(self):
+        for query in UNRELATED_QUERIES:
+            with self.subTest(query=query):
+                self.assertIsNone(self.engine._knowledge_topic(query))
+                response = self.engine._generate_general_response({'original_query': query})
+                self.assertIn('General Farming Guidance', response['message'])
+    
+    def test_related_queries_answer_from_knowledge_base(self):
+        for query, topic in [
+            ('aphids', ('pests', 'aphids')),
+            ('tell me about rice', ('crops', 'rice')),
+            ('integrated pest management', ('best_practices', 'integrated_pest_management')),
+        ]:
+            with self.subTest(query=query):
+                self.assertEqual(self.engine._knowledge_topic(query), topic)
+
+if __name__ == '__main__':
+    unittest.main()
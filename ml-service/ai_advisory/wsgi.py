@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+WSGI entrypoint for the Farmora AI Advisory API
+Serve with gunicorn's threaded workers so concurrent image requests can be
+batched together:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py calls init_worker() in every worker after the fork; other
+WSGI servers should call it once per process before serving requests.
+"""
+
+from advanced_advisory_api import app, ai_advisor, _schedule_session_cleanup
+
+def init_worker():
+    """Per-process setup: TensorFlow state and background threads do not survive a fork"""
+    ai_advisor.initialize_ml_model()
+    _schedule_session_cleanup()